@@ -1,15 +1,23 @@
+from lazy_imports import lazy_import, timed_imports, import_report, total_import_ms, IMPORT_BUDGET_MS
+timed_imports('streamlit', 'numpy', 'catalog', 'loaders')
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import constants
+import os
+import time
 import warnings
+from spectral import VISIBLE_RANGE
+from reverse_search import SpectrumFormatError, identify_elements
+from views import (DashboardViews, PAGE_CSS, HEADER_HTML, FOOTER_HTML, SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH,
+                   MAX_PLAYBACK_ELEMENTS, selection_key)
+from loaders import open_source
+from refresh import CatalogRefresher
+from instrumentation import PROFILER, PROFILE_MODE
 warnings.filterwarnings('ignore')
 
+# Modules lourds chargés seulement quand une vue en a besoin
+pd = lazy_import('pandas')
+go = lazy_import('plotly.graph_objects')
+
 # Configuration de la page
 st.set_page_config(
     page_title="Tableau Périodique par Date de Découverte",
@@ -18,348 +26,112 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS personnalisé
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        background: linear-gradient(45deg, #8B4513, #D2691E, #CD853F);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        text-align: center;
-        margin-bottom: 2rem;
-        font-weight: bold;
-    }
-    .section-header {
-        color: #8B4513;
-        border-bottom: 2px solid #D2691E;
-        padding-bottom: 0.5rem;
-        margin-top: 2rem;
-        font-weight: bold;
-    }
-    .epoch-antique { 
-        background-color: #F5DEB3; 
-        border-left: 5px solid #8B4513; 
-        color: #333;
-    }
-    .epoch-moyenage { 
-        background-color: #DEB887; 
-        border-left: 5px solid #A0522D; 
-        color: #333;
-    }
-    .epoch-renaissance { 
-        background-color: #F4A460; 
-        border-left: 5px solid #D2691E; 
-        color: #333;
-    }
-    .epoch-revolution { 
-        background-color: #CD853F; 
-        border-left: 5px solid #8B4513; 
-        color: white;
-    }
-    .epoch-spectro { 
-        background-color: #D2691E; 
-        border-left: 5px solid #A52A2A; 
-        color: white;
-    }
-    .epoch-moderne { 
-        background-color: #A0522D; 
-        border-left: 5px solid #8B0000; 
-        color: white;
-    }
-    .discovery-card {
-        background-color: #f8f9fa;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 0.5rem 0;
-        border: 1px solid #ddd;
-        color: #333333;
-    }
-    .rgb-spectrum {
-        height: 20px;
-        border-radius: 10px;
-        margin: 5px 0;
-        border: 1px solid #ccc;
-    }
-    .timeline-period {
-        padding: 0.5rem;
-        border-radius: 5px;
-        text-align: center;
-        margin: 0.2rem;
-        font-weight: bold;
-    }
-</style>
-""", unsafe_allow_html=True)
+# CSS personnalisé, partagé avec l'export statique (views.py)
+st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
-class HistoricalPeriodicTableDashboard:
-    def __init__(self):
-        self.elements_data = self.define_elements_with_discovery_dates()
-        self.epochs_data = self.define_historical_epochs()
-        self.spectral_data = self.define_spectral_rgb_data()
-        
-    def define_historical_epochs(self):
-        """Définit les périodes historiques de découverte"""
-        return [
-            {
-                'nom': 'Antiquité', 'periode': 'Avant 500', 'couleur': '#F5DEB3',
-                'description': 'Éléments connus depuis l\'antiquité',
-                'elements': ['C', 'S', 'Fe', 'Cu', 'Ag', 'Sn', 'Au', 'Hg', 'Pb']
-            },
-            {
-                'nom': 'Moyen-Âge', 'periode': '500-1500', 'couleur': '#DEB887',
-                'description': 'Éléments découverts au Moyen-Âge',
-                'elements': ['As', 'Sb', 'Bi', 'Zn']
-            },
-            {
-                'nom': 'Renaissance', 'periode': '1500-1700', 'couleur': '#F4A460',
-                'description': 'Découvertes de la Renaissance',
-                'elements': ['P', 'Co', 'Ni', 'Pt']
-            },
-            {
-                'nom': 'Révolution Chimique', 'periode': '1700-1800', 'couleur': '#CD853F',
-                'description': 'Période de la révolution chimique',
-                'elements': ['H', 'N', 'O', 'Cl', 'Mn', 'Mo', 'Te', 'Cr', 'W', 'U', 'Ti', 'Be']
-            },
-            {
-                'nom': 'Ère Spectroscopique', 'periode': '1800-1900', 'couleur': '#D2691E',
-                'description': 'Découvertes par spectroscopie',
-                'elements': ['Li', 'Na', 'K', 'Rb', 'Cs', 'Ca', 'Sr', 'Ba', 'B', 'Al', 'Si', 'Se', 'Br', 'I', 'He', 'Ne', 'Ar', 'Kr', 'Xe']
-            },
-            {
-                'nom': 'Période Moderne', 'periode': '1900-Aujourd\'hui', 'couleur': '#A0522D',
-                'description': 'Éléments découverts au 20ème siècle',
-                'elements': ['Ra', 'Rn', 'Fr', 'Tc', 'Pm', 'Tous les actinides']
-            }
-        ]
-    
-    def define_elements_with_discovery_dates(self):
-        """Définit les éléments avec leurs dates de découverte"""
-        return [
-            # Éléments antiques
-            {'symbole': 'C', 'nom': 'Carbone', 'date_decouverte': -25000, 'decouvreur': 'Préhistoire', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'S', 'nom': 'Soufre', 'date_decouverte': -2000, 'decouvreur': 'Chinois anciens', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Fe', 'nom': 'Fer', 'date_decouverte': -1500, 'decouvreur': 'Hittites', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Cu', 'nom': 'Cuivre', 'date_decouverte': -9000, 'decouvreur': 'Moyen-Orient', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Ag', 'nom': 'Argent', 'date_decouverte': -3000, 'decouvreur': 'Mésopotamiens', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Sn', 'nom': 'Étain', 'date_decouverte': -2000, 'decouvreur': 'Civilisations anciennes', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Au', 'nom': 'Or', 'date_decouverte': -6000, 'decouvreur': 'Égyptiens', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Hg', 'nom': 'Mercure', 'date_decouverte': -1500, 'decouvreur': 'Chinois/Égyptiens', 'periode_epoch': 'Antiquité'},
-            {'symbole': 'Pb', 'nom': 'Plomb', 'date_decouverte': -3000, 'decouvreur': 'Mésopotamiens', 'periode_epoch': 'Antiquité'},
-            
-            # Moyen-Âge
-            {'symbole': 'As', 'nom': 'Arsenic', 'date_decouverte': 1250, 'decouvreur': 'Albert le Grand', 'periode_epoch': 'Moyen-Âge'},
-            {'symbole': 'Sb', 'nom': 'Antimoine', 'date_decouverte': 800, 'decouvreur': 'Jâbir ibn Hayyân', 'periode_epoch': 'Moyen-Âge'},
-            {'symbole': 'Bi', 'nom': 'Bismuth', 'date_decouverte': 1400, 'decouvreur': 'Inconnu', 'periode_epoch': 'Moyen-Âge'},
-            {'symbole': 'Zn', 'nom': 'Zinc', 'date_decouverte': 1000, 'decouvreur': 'Indiens', 'periode_epoch': 'Moyen-Âge'},
-            
-            # Renaissance
-            {'symbole': 'P', 'nom': 'Phosphore', 'date_decouverte': 1669, 'decouvreur': 'H. Brand', 'periode_epoch': 'Renaissance'},
-            {'symbole': 'Co', 'nom': 'Cobalt', 'date_decouverte': 1735, 'decouvreur': 'G. Brandt', 'periode_epoch': 'Renaissance'},
-            {'symbole': 'Ni', 'nom': 'Nickel', 'date_decouverte': 1751, 'decouvreur': 'A. F. Cronstedt', 'periode_epoch': 'Renaissance'},
-            {'symbole': 'Pt', 'nom': 'Platine', 'date_decouverte': 1557, 'decouvreur': 'J. C. Scaliger', 'periode_epoch': 'Renaissance'},
-            
-            # Révolution Chimique
-            {'symbole': 'H', 'nom': 'Hydrogène', 'date_decouverte': 1766, 'decouvreur': 'H. Cavendish', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'N', 'nom': 'Azote', 'date_decouverte': 1772, 'decouvreur': 'D. Rutherford', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'O', 'nom': 'Oxygène', 'date_decouverte': 1774, 'decouvreur': 'J. Priestley', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'Cl', 'nom': 'Chlore', 'date_decouverte': 1774, 'decouvreur': 'C. W. Scheele', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'Mn', 'nom': 'Manganèse', 'date_decouverte': 1774, 'decouvreur': 'J. G. Gahn', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'Cr', 'nom': 'Chrome', 'date_decouverte': 1797, 'decouvreur': 'L. N. Vauquelin', 'periode_epoch': 'Révolution Chimique'},
-            {'symbole': 'U', 'nom': 'Uranium', 'date_decouverte': 1789, 'decouvreur': 'M. H. Klaproth', 'periode_epoch': 'Révolution Chimique'},
-            
-            # Ère Spectroscopique
-            {'symbole': 'Li', 'nom': 'Lithium', 'date_decouverte': 1817, 'decouvreur': 'J. A. Arfwedson', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Na', 'nom': 'Sodium', 'date_decouverte': 1807, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'K', 'nom': 'Potassium', 'date_decouverte': 1807, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Rb', 'nom': 'Rubidium', 'date_decouverte': 1861, 'decouvreur': 'R. Bunsen, G. Kirchhoff', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Cs', 'nom': 'Césium', 'date_decouverte': 1860, 'decouvreur': 'R. Bunsen, G. Kirchhoff', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Ca', 'nom': 'Calcium', 'date_decouverte': 1808, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Sr', 'nom': 'Strontium', 'date_decouverte': 1790, 'decouvreur': 'A. Crawford', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Ba', 'nom': 'Baryum', 'date_decouverte': 1808, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'He', 'nom': 'Hélium', 'date_decouverte': 1868, 'decouvreur': 'P. Janssen, J. N. Lockyer', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Ne', 'nom': 'Néon', 'date_decouverte': 1898, 'decouvreur': 'W. Ramsay, M. Travers', 'periode_epoch': 'Ère Spectroscopique'},
-            {'symbole': 'Ar', 'nom': 'Argon', 'date_decouverte': 1894, 'decouvreur': 'Lord Rayleigh, W. Ramsay', 'periode_epoch': 'Ère Spectroscopique'},
-            
-            # Période Moderne
-            {'symbole': 'Ra', 'nom': 'Radium', 'date_decouverte': 1898, 'decouvreur': 'P. et M. Curie', 'periode_epoch': 'Période Moderne'},
-            {'symbole': 'Rn', 'nom': 'Radon', 'date_decouverte': 1900, 'decouvreur': 'F. E. Dorn', 'periode_epoch': 'Période Moderne'},
-            {'symbole': 'Fr', 'nom': 'Francium', 'date_decouverte': 1939, 'decouvreur': 'M. Perey', 'periode_epoch': 'Période Moderne'},
-            {'symbole': 'Tc', 'nom': 'Technétium', 'date_decouverte': 1937, 'decouvreur': 'C. Perrier, E. Segrè', 'periode_epoch': 'Période Moderne'}
-        ]
+# Intervalles [début, fin) des années de découverte pour chaque filtre de siècle
+SIECLES = {
+    "Avant JC": (None, 1),
+    "1-1000": (1, 1001),
+    **{f"{n}ème": ((n - 1) * 100 + 1, n * 100 + 1) for n in range(11, 22)}
+}
+DEFAULT_SIECLES = ["18ème", "19ème"]
+
+# Résultats de l'identification spectrale
+REVERSE_SEARCH_RESULTS = 10
+# Résultats proposés par la recherche de l'explorateur
+SEARCH_RESULTS = 20
+
+# Comparaison: nombre maximal d'éléments superposés
+COMPARISON_LIMIT = 200
+
+# Axes proposés pour la frise chronologique
+TIMELINE_AXES = {"Années": 'signed', "Échelle log": 'log'}
+
+# Fragments des vues: leurs reruns partiels sont mesurés par l'instrumentation comme des reruns
+view_fragment = PROFILER.fragment(st.fragment, lambda: st.session_state.setdefault('profil', {}))
+
+@st.cache_resource(show_spinner=False)
+def catalog_refresher():
+    """Catalogue construit une seule fois par processus serveur, puis actualisé en arrière-plan"""
+    # Définitions intégrées par défaut, ou répertoire CSV/JSON désigné par DASHBOARD_DATA_DIR
+    return CatalogRefresher(open_source(os.environ.get('DASHBOARD_DATA_DIR')), warm=warm_view_caches).start()
+
+def load_catalog():
+    """Version courante du catalogue, lue une fois par rerun"""
+    return catalog_refresher().catalog
+
+class HistoricalPeriodicTableDashboard(DashboardViews):
+    def __init__(self, catalog=None):
+        super().__init__(catalog if catalog is not None else load_catalog())
+        
+    def display_header(self):
+        """Affiche l'en-tête du dashboard"""
+        st.markdown(HEADER_HTML, unsafe_allow_html=True)
     
-    def define_spectral_rgb_data(self):
-        """Définit les données spectrales RGB pour chaque élément"""
-        return {
-            # Spectres rouges caractéristiques
-            'Li': {'rgb': (255, 0, 0), 'longueur_onde_principale': 670.8, 'raies': ['670.8 nm']},
-            'Rb': {'rgb': (200, 50, 50), 'longueur_onde_principale': 780.0, 'raies': ['780.0 nm', '794.8 nm']},
-            'Sr': {'rgb': (255, 100, 100), 'longueur_onde_principale': 460.7, 'raies': ['460.7 nm']},
-            
-            # Spectres verts caractéristiques
-            'Tl': {'rgb': (0, 255, 0), 'longueur_onde_principale': 535.0, 'raies': ['535.0 nm']},
-            'Ba': {'rgb': (100, 255, 100), 'longueur_onde_principale': 553.5, 'raies': ['553.5 nm']},
-            'Cu': {'rgb': (0, 200, 0), 'longueur_onde_principale': 521.8, 'raies': ['521.8 nm']},
-            
-            # Spectres bleus caractéristiques
-            'Cs': {'rgb': (0, 0, 255), 'longueur_onde_principale': 455.5, 'raies': ['455.5 nm']},
-            'Hg': {'rgb': (100, 100, 255), 'longueur_onde_principale': 435.8, 'raies': ['435.8 nm']},
-            'As': {'rgb': (50, 50, 200), 'longueur_onde_principale': 450.0, 'raies': ['450.0 nm']},
-            
-            # Spectres mixtes
-            'Na': {'rgb': (255, 255, 0), 'longueur_onde_principale': 589.0, 'raies': ['589.0 nm', '589.6 nm']},
-            'K': {'rgb': (255, 200, 0), 'longueur_onde_principale': 766.5, 'raies': ['766.5 nm', '769.9 nm']},
-            'H': {'rgb': (255, 100, 255), 'longueur_onde_principale': 656.3, 'raies': ['656.3 nm (Hα)', '486.1 nm (Hβ)']},
-            'He': {'rgb': (200, 150, 255), 'longueur_onde_principale': 587.6, 'raies': ['587.6 nm']},
-            'Ne': {'rgb': (255, 100, 100), 'longueur_onde_principale': 640.2, 'raies': ['640.2 nm']}
-        }
+    def select_elements(self, siecles):
+        """Masque des éléments découverts dans les siècles choisis (tous si aucun)"""
+        if not siecles:
+            return np.ones(len(self.columns), dtype=bool)
+        return self.columns.mask_year_ranges(SIECLES[siecle] for siecle in siecles)
     
-    def get_element_rgb(self, element_symb):
-        """Retourne la couleur RGB d'un élément"""
-        if element_symb in self.spectral_data:
-            return self.spectral_data[element_symb]['rgb']
-        else:
-            # Couleur par défaut basée sur la période de découverte
-            epoch_colors = {
-                'Antiquité': (245, 222, 179),
-                'Moyen-Âge': (222, 184, 135),
-                'Renaissance': (244, 164, 96),
-                'Révolution Chimique': (205, 133, 63),
-                'Ère Spectroscopique': (210, 105, 30),
-                'Période Moderne': (160, 82, 45)
-            }
-            element = next((e for e in self.elements_data if e['symbole'] == element_symb), None)
-            if element and element['periode_epoch'] in epoch_colors:
-                return epoch_colors[element['periode_epoch']]
-            return (200, 200, 200)  # Gris par défaut
+    def show_figure(self, view, filters, build):
+        """Affiche une figure du cache partagé, construite au premier affichage"""
+        st.plotly_chart(self.cached_figure(view, filters, build), use_container_width=True)
     
-    def display_header(self):
-        """Affiche l'en-tête du dashboard"""
-        st.markdown('<h1 class="main-header">🕰️ Tableau Périodique par Date de Découverte</h1>', 
-                   unsafe_allow_html=True)
+    @view_fragment
+    def create_timeline_view(self, selection=None):
+        """Crée une vue chronologique des découvertes
         
-        st.markdown("""
-        <div style='text-align: center; color: #666; margin-bottom: 2rem;'>
-        <strong>Classification historique des éléments avec leurs spectres RGB caractéristiques</strong><br>
-        Explorez l'histoire de la découverte des éléments et leurs signatures spectrales
-        </div>
-        """, unsafe_allow_html=True)
-    
-    def create_timeline_view(self):
-        """Crée une vue chronologique des découvertes"""
+        Fragment: changer l'axe ou la période ne réexécute que la frise.
+        Entrées: sélection, axe, période affichée, version des données.
+        """
         st.markdown('<h3 class="section-header">📅 FRISE CHRONOLOGIQUE DES DÉCOUVERTES</h3>', 
                    unsafe_allow_html=True)
         
-        # Préparer les données pour la timeline
-        timeline_data = []
-        for element in self.elements_data:
-            if element['date_decouverte'] > -10000:  # Filtrer les dates trop anciennes
-                rgb = self.get_element_rgb(element['symbole'])
-                timeline_data.append({
-                    'Element': element['symbole'],
-                    'Nom': element['nom'],
-                    'Année': max(0, element['date_decouverte']),
-                    'Découvreur': element['decouvreur'],
-                    'Période': element['periode_epoch'],
-                    'Couleur': f'rgb({rgb[0]}, {rgb[1]}, {rgb[2]})'
-                })
-        
-        df_timeline = pd.DataFrame(timeline_data)
-        
-        # Timeline interactive
-        fig = px.scatter(df_timeline, 
-                        x='Année', 
-                        y=[1]*len(df_timeline),
-                        color='Période',
-                        hover_data=['Nom', 'Découvreur'],
-                        title="Chronologie des Découvertes des Éléments",
-                        color_discrete_sequence=['#F5DEB3', '#DEB887', '#F4A460', '#CD853F', '#D2691E', '#A0522D'])
-        
-        fig.update_traces(marker=dict(size=12, line=dict(width=2, color='DarkSlateGrey')),
-                         selector=dict(mode='markers'))
-        fig.update_layout(yaxis=dict(showticklabels=False, title=''),
-                         height=400)
-        
-        st.plotly_chart(fig, use_container_width=True)
+        # Lecture animée, précalculée et jouée dans le navigateur sans rerun
+        if st.toggle("▶️ Rejouer l'histoire des découvertes"):
+            count = len(self.columns) if selection is None else np.count_nonzero(selection)
+            if count > MAX_PLAYBACK_ELEMENTS:
+                st.warning(f"{count} éléments: seuls les {MAX_PLAYBACK_ELEMENTS} premiers découverts sont rejoués.")
+            self.show_figure('lecture', selection_key(selection), lambda: self.build_playback_figure(selection))
+            return
+        
+        # Axe du temps et période affichée; le regroupement s'adapte à la période choisie
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            axis = TIMELINE_AXES[st.radio("Axe du temps:", list(TIMELINE_AXES), horizontal=True)]
+        bounds = self.timeline_bounds(selection)
+        window = None
+        if bounds is not None:
+            with col2:
+                window = st.slider("Période affichée:", *bounds, bounds)
+        
+        st.plotly_chart(self.timeline_figure(selection, axis, window), use_container_width=True)
     
-    def create_epoch_overview(self):
-        """Affiche une vue par époque historique"""
+    def create_epoch_overview(self, selection=None):
+        """Affiche une vue par époque historique
+        
+        Entrées: sélection, version des données.
+        """
         st.markdown('<h3 class="section-header">🏺 CLASSIFICATION PAR ÉPOQUE HISTORIQUE</h3>', 
                    unsafe_allow_html=True)
         
-        for epoch in self.epochs_data:
-            elements_epoch = [e for e in self.elements_data if e['periode_epoch'] == epoch['nom']]
-            
-            st.markdown(f"""
-            <div class="epoch-{epoch['nom'].lower().replace(' ', '').replace('é', 'e')}">
-                <h3>{epoch['nom']} ({epoch['periode']})</h3>
-                <p>{epoch['description']}</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Afficher les éléments de cette époque
-            cols = st.columns(6)
-            for i, element in enumerate(elements_epoch[:6]):  # Maximum 6 éléments par ligne
-                with cols[i % 6]:
-                    rgb = self.get_element_rgb(element['symbole'])
-                    rgb_hex = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                    
-                    st.markdown(f"""
-                    <div class="discovery-card">
-                        <div style="text-align: center;">
-                            <h4>{element['symbole']}</h4>
-                            <div class="rgb-spectrum" style="background: linear-gradient(90deg, {rgb_hex}80, {rgb_hex});"></div>
-                            <strong>{element['nom']}</strong><br>
-                            <small>Découvert en {element['date_decouverte'] if element['date_decouverte'] > 0 else 'Antiquité'}</small><br>
-                            <small><em>{element['decouvreur'][:20]}{'...' if len(element['decouvreur']) > 20 else ''}</em></small>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            if len(elements_epoch) > 6:
-                cols = st.columns(6)
-                for i, element in enumerate(elements_epoch[6:12]):
-                    with cols[i % 6]:
-                        rgb = self.get_element_rgb(element['symbole'])
-                        rgb_hex = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                        
-                        st.markdown(f"""
-                        <div class="discovery-card">
-                            <div style="text-align: center;">
-                                <h4>{element['symbole']}</h4>
-                                <div class="rgb-spectrum" style="background: linear-gradient(90deg, {rgb_hex}80, {rgb_hex});"></div>
-                                <strong>{element['nom']}</strong><br>
-                                <small>Découvert en {element['date_decouverte'] if element['date_decouverte'] > 0 else 'Antiquité'}</small><br>
-                                <small><em>{element['decouvreur'][:20]}{'...' if len(element['decouvreur']) > 20 else ''}</em></small>
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            st.markdown("---")
+        # Un seul message par époque, quel que soit son nombre d'éléments
+        for block in self.epoch_blocks(selection):
+            st.markdown(block, unsafe_allow_html=True)
     
-    def create_spectral_rgb_analysis(self):
-        """Analyse des spectres RGB par période"""
+    def create_spectral_rgb_analysis(self, selection=None):
+        """Analyse des spectres RGB par période
+        
+        Entrées: sélection, version des données.
+        """
         st.markdown('<h3 class="section-header">🌈 ANALYSE DES SPECTRES RGB PAR PÉRIODE</h3>', 
                    unsafe_allow_html=True)
         
         # Statistiques par époque
-        epoch_stats = []
-        for epoch in self.epochs_data:
-            elements_epoch = [e for e in self.elements_data if e['periode_epoch'] == epoch['nom']]
-            elements_with_spectra = [e for e in elements_epoch if e['symbole'] in self.spectral_data]
-            
-            if elements_with_spectra:
-                # Calculer la couleur moyenne
-                rgb_values = [self.get_element_rgb(e['symbole']) for e in elements_with_spectra]
-                avg_rgb = tuple(int(np.mean([rgb[i] for rgb in rgb_values])) for i in range(3))
-                
-                epoch_stats.append({
-                    'Époque': epoch['nom'],
-                    'Période': epoch['periode'],
-                    'Nombre éléments': len(elements_epoch),
-                    'Éléments avec spectre': len(elements_with_spectra),
-                    'Couleur moyenne': f'rgb{avg_rgb}',
-                    'RGB': avg_rgb
-                })
+        selection = np.ones(len(self.columns), dtype=bool) if selection is None else selection
+        epoch_stats = self.epoch_stats(selection)
         
         # Afficher les statistiques
         col1, col2 = st.columns([2, 1])
@@ -368,47 +140,21 @@ class HistoricalPeriodicTableDashboard:
             st.subheader("Palette des Époques")
             
             for stat in epoch_stats:
-                rgb = stat['RGB']
-                rgb_hex = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-                
-                st.markdown(f"""
-                <div style="display: flex; align-items: center; margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-radius: 5px;">
-                    <div style="width: 50px; height: 50px; background-color: {rgb_hex}; border-radius: 5px; margin-right: 15px; border: 1px solid #ccc;"></div>
-                    <div>
-                        <strong>{stat['Époque']}</strong> ({stat['Période']})<br>
-                        <small>{stat['Éléments avec spectre']}/{stat['Nombre éléments']} éléments avec spectre RGB</small>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(self.palette_entry_html(stat), unsafe_allow_html=True)
         
         with col2:
             st.subheader("Évolution des Couleurs")
             
             # Graphique d'évolution
-            fig = go.Figure()
-            
-            for i, stat in enumerate(epoch_stats):
-                fig.add_trace(go.Scatter(
-                    x=[i], y=[1],
-                    mode='markers',
-                    marker=dict(size=30, color=stat['Couleur moyenne'], line=dict(width=2, color='black')),
-                    name=stat['Époque'],
-                    text=f"{stat['Époque']}<br>RGB: {stat['RGB']}",
-                    hoverinfo='text'
-                ))
-            
-            fig.update_layout(
-                title="Évolution des Palettes Spectrales",
-                xaxis=dict(showticklabels=False, title=""),
-                yaxis=dict(showticklabels=False, title=""),
-                height=300,
-                showlegend=False
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(self.palette_figure(selection), use_container_width=True)
     
-    def create_spectral_explorer(self):
-        """Explorateur détaillé des spectres"""
+    @view_fragment
+    def create_spectral_explorer(self, selection=None):
+        """Explorateur détaillé des spectres
+        
+        Fragment: changer d'élément ou de recherche ne réexécute que l'explorateur.
+        Entrées: sélection (liste des éléments), élément choisi, version des données.
+        """
         st.markdown('<h3 class="section-header">🔍 EXPLORATEUR DES SPECTRES RGB</h3>', 
                    unsafe_allow_html=True)
         
@@ -416,98 +162,180 @@ class HistoricalPeriodicTableDashboard:
         col1, col2 = st.columns([1, 3])
         
         with col1:
-            element_choice = st.selectbox("Choisir un élément:", 
-                                        [f"{e['symbole']} - {e['nom']}" for e in self.elements_data])
+            # Recherche dans tout le catalogue; le premier résultat s'affiche directement
+            query = st.text_input("Rechercher:", placeholder="symbole, nom, découvreur, époque, raie (nm)")
+            options = self.explorer_options(selection)
+            if query.strip():
+                indices, _ = self.catalog.search.find(query, limit=SEARCH_RESULTS)
+                if len(indices):
+                    options = self.explorer_labels(indices)
+                    st.caption(f"{len(indices)} résultat(s)")
+                else:
+                    st.caption("Aucun résultat")
+            element_choice = st.selectbox("Choisir un élément:", options)
             element_symb = element_choice.split(' - ')[0]
-            element_data = next(e for e in self.elements_data if e['symbole'] == element_symb)
+        
+        banner_html, history_html, spectrum_html, simulated_html = self.cached_fragment(
+            'explorateur', element_symb,
+            lambda: (self.element_banner_html(element_symb), *self.element_cards_html(element_symb)))
         
         with col2:
-            rgb = self.get_element_rgb(element_symb)
-            rgb_hex = f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
-            
-            st.markdown(f"""
-            <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, {rgb_hex}20, {rgb_hex}50); border-radius: 10px;">
-                <h2>{element_data['symbole']} - {element_data['nom']}</h2>
-                <div style="display: flex; justify-content: center; align-items: center; margin: 20px 0;">
-                    <div style="width: 100px; height: 100px; background-color: {rgb_hex}; border-radius: 50%; border: 3px solid white; box-shadow: 0 4px 8px rgba(0,0,0,0.2);"></div>
-                </div>
-                <p><strong>Spectre RGB caractéristique</strong></p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(banner_html, unsafe_allow_html=True)
         
         # Détails de l'élément
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.markdown(f"""
-            <div class="discovery-card">
-                <h4>📜 Historique</h4>
-                <strong>Date de découverte:</strong> {element_data['date_decouverte'] if element_data['date_decouverte'] > 0 else 'Antiquité'}<br>
-                <strong>Découvreur:</strong> {element_data['decouvreur']}<br>
-                <strong>Période historique:</strong> {element_data['periode_epoch']}
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(history_html, unsafe_allow_html=True)
         
         with col2:
-            if element_symb in self.spectral_data:
-                spectral_info = self.spectral_data[element_symb]
-                st.markdown(f"""
-                <div class="discovery-card">
-                    <h4>🌈 Spectre</h4>
-                    <strong>Couleur RGB:</strong> {rgb}<br>
-                    <strong>Longueur d'onde principale:</strong> {spectral_info['longueur_onde_principale']} nm<br>
-                    <strong>Raies caractéristiques:</strong><br>
-                    {', '.join(spectral_info['raies'])}
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="discovery-card">
-                    <h4>🌈 Spectre</h4>
-                    <strong>Couleur d'époque:</strong> {rgb}<br>
-                    <em>Spectre RGB spécifique non défini</em>
-                </div>
-                """, unsafe_allow_html=True)
+            st.markdown(spectrum_html, unsafe_allow_html=True)
         
         with col3:
             # Simulation du spectre
-            st.markdown(f"""
-            <div class="discovery-card">
-                <h4>📊 Spectre Simulé</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Spectre simulé simple
-            lambda_range = np.linspace(380, 780, 400)
-            spectre = np.zeros_like(lambda_range)
-            
-            if element_symb in self.spectral_data:
-                # Ajouter des raies spectrales simulées
-                raie_principale = self.spectral_data[element_symb]['longueur_onde_principale']
-                spectre += 0.8 * np.exp(-0.5 * ((lambda_range - raie_principale) / 10)**2)
-                
-                # Ajouter d'autres raies
-                for i in range(3):
-                    raie_pos = raie_principale + (i+1)*30
-                    if 380 <= raie_pos <= 780:
-                        spectre += 0.3 * np.exp(-0.5 * ((lambda_range - raie_pos) / 8)**2)
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatter(
-                x=lambda_range, y=spectre,
-                mode='lines',
-                line=dict(color=rgb_hex, width=3),
-                name=f"Spectre {element_symb}"
-            ))
+            st.markdown(simulated_html, unsafe_allow_html=True)
             
+            # Spectre simulé à partir des raies, mis en cache par le moteur spectral
+            st.plotly_chart(self.spectrum_figure(element_symb), use_container_width=True)
+    
+    @view_fragment
+    def create_comparison_view(self, selection=None):
+        """Compare les spectres et les dates de découverte de plusieurs éléments
+        
+        Fragment: changer les éléments comparés ne réexécute que cette vue.
+        Entrées: sélection (liste des éléments), éléments ou époque choisis, version des données.
+        """
+        st.markdown('<h3 class="section-header">⚖️ COMPARAISON DES ÉLÉMENTS</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            epoch_name = st.selectbox("Comparer une époque entière:",
+                                      ["—"] + [epoch['nom'] for epoch in self.epochs_data])
+        with col2:
+            options = self.explorer_options(selection)
+            chosen = st.multiselect("Ou choisir les éléments:", options, default=options[:6],
+                                    disabled=epoch_name != "—")
+        
+        if epoch_name != "—":
+            symbols = self.columns.symbols[self.columns.mask_epoch(epoch_name)].tolist()
+        else:
+            symbols = [choice.split(' - ')[0] for choice in chosen]
+        if len(symbols) < 2:
+            st.info("Choisir au moins deux éléments à comparer.")
+            return
+        if len(symbols) > COMPARISON_LIMIT:
+            st.warning(f"{len(symbols)} éléments: seuls les {COMPARISON_LIMIT} premiers sont comparés.")
+            symbols = symbols[:COMPARISON_LIMIT]
+        symbols = tuple(symbols)
+        
+        self.show_figure('comparaison', symbols, lambda: self.build_comparison_figure(list(symbols)))
+        
+        overlaps, pairs = self.cached_fragment('recouvrement', symbols, lambda: self.compute_overlaps(list(symbols)))
+        col1, col2 = st.columns([3, 2])
+        with col1:
+            self.show_figure('recouvrement', symbols, lambda: self.build_overlap_figure(list(symbols), overlaps))
+        with col2:
+            st.subheader("Spectres les plus proches")
+            st.dataframe(pd.DataFrame(pairs), hide_index=True, use_container_width=True)
+        
+        st.subheader("Écarts de découverte")
+        st.dataframe(pd.DataFrame(self.cached_fragment('ecarts', symbols, lambda: self.discovery_deltas(symbols))),
+                     hide_index=True, use_container_width=True)
+    
+    @view_fragment
+    def create_line_search(self):
+        """Recherche des éléments émettant dans une fenêtre de longueurs d'onde
+        
+        Fragment: déplacer la fenêtre ne réexécute que cette recherche.
+        Entrées: fenêtre, version des données.
+        """
+        st.markdown('<h3 class="section-header">🔦 RECHERCHE PAR LONGUEUR D\'ONDE</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            start, end = st.slider("Fenêtre (nm):", *VISIBLE_RANGE, (585.0, 590.0), step=0.5)
+            matches = self.lines.elements_in_window(start, end)
+            if matches:
+                st.markdown("\n".join(
+                    f"- **{symb}** {self.index.by_symbol[symb]['nom'] if symb in self.index.by_symbol else ''}"
+                    f" (intensité {intensity:.2f})"
+                    for symb, intensity in matches))
+            else:
+                st.info(f"Aucune raie entre {start} et {end} nm.")
+        
+        with col2:
+            self.show_figure('raies', (start, end), lambda: self.build_line_spectrum_figure(start, end))
+    
+    @view_fragment
+    def create_reverse_search(self):
+        """Identifie les éléments présents dans un spectre mesuré
+        
+        Fragment: le dépôt d'un fichier ou le choix de la tolérance ne réexécutent que cette vue.
+        Entrées: fichier, tolérance, version des données.
+        """
+        st.markdown('<h3 class="section-header">🧪 IDENTIFICATION À PARTIR D\'UN SPECTRE</h3>', 
+                   unsafe_allow_html=True)
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            uploaded = st.file_uploader("Spectre mesuré (CSV: longueur d'onde en nm, intensité)",
+                                        type=['csv', 'txt'])
+            tolerance = st.number_input("Tolérance (nm):", min_value=0.01, max_value=5.0,
+                                        value=0.5, step=0.05)
+        
+        if uploaded is None:
+            st.info("Chargez un spectre pour classer les éléments dont les raies correspondent.")
+            return
+        
+        # Résultat conservé pour la session: les reruns suivants ne relisent pas le fichier
+        key = ('identification', uploaded.file_id, tolerance, self.catalog.version)
+        if key not in st.session_state:
+            progress = st.progress(0.0, text="Lecture du spectre...")
+            try:
+                st.session_state[key] = identify_elements(
+                    uploaded, self.lines, tolerance,
+                    progress=lambda fraction: progress.progress(fraction, text=f"Lecture du spectre... {fraction:.0%}"))
+            except SpectrumFormatError as error:
+                st.error(str(error))
+                return
+            finally:
+                progress.empty()
+        ranking, (peak_wavelengths, peak_intensities), samples = st.session_state[key]
+        
+        with col1:
+            st.caption(f"{samples} échantillons, {len(peak_wavelengths)} pics retenus")
+            if ranking:
+                st.dataframe(pd.DataFrame([
+                    {'Élément': row['symbole'],
+                     'Nom': self.index.by_symbol[row['symbole']]['nom'] if row['symbole'] in self.index.by_symbol else '',
+                     'Score': round(row['score'], 3),
+                     'Raies': f"{row['raies_trouvees']}/{row['raies_attendues']}"}
+                    for row in ranking[:REVERSE_SEARCH_RESULTS]
+                ]), hide_index=True, use_container_width=True)
+            else:
+                st.warning("Aucune raie connue ne correspond aux pics détectés.")
+        
+        with col2:
+            fig = go.Figure(go.Bar(x=peak_wavelengths, y=peak_intensities, marker_line_width=0,
+                                   marker_color='#8B4513', name="Pics détectés"))
+            for row in ranking[:3]:
+                element_lines = self.lines.element_lines(row['symbole'])
+                fig.add_trace(go.Scatter(
+                    x=element_lines['wavelength'], y=element_lines['intensity'] / element_lines['intensity'].max(),
+                    mode='markers', marker=dict(size=10, symbol='triangle-down',
+                                                color=self.index.element_hex(row['symbole'])),
+                    name=row['symbole']
+                ))
             fig.update_layout(
-                title=f"Spectre simulé de {element_symb}",
+                title="Pics détectés et raies des meilleurs candidats",
                 xaxis=dict(title="Longueur d'onde (nm)"),
                 yaxis=dict(title="Intensité relative"),
-                height=200,
-                showlegend=False
+                height=350
             )
-            
             st.plotly_chart(fig, use_container_width=True)
     
     def create_sidebar(self):
@@ -516,15 +344,19 @@ class HistoricalPeriodicTableDashboard:
         
         # Navigation principale
         st.sidebar.markdown("### 🧭 Vues Historiques")
-        section = st.sidebar.radio("Choisir la vue:", 
-                                 ["Frise Chronologique", "Vue par Époque", "Analyse Spectrale", "Explorateur"])
+        sections = ["Frise Chronologique", "Vue par Époque", "Analyse Spectrale", "Explorateur",
+                    "Comparaison", "Identification Spectrale"]
+        # Section cachée, présente seulement quand l'instrumentation est activée
+        if PROFILER.enabled:
+            sections.append("Performance")
+        section = st.sidebar.radio("Choisir la vue:", sections)
         
         # Filtres temporels
         st.sidebar.markdown("### ⏳ Filtres Temporels")
         siecles = st.sidebar.multiselect(
             "Siècles:",
-            ["Avant JC", "1-1000", "11ème", "12ème", "13ème", "14ème", "15ème", "16ème", "17ème", "18ème", "19ème", "20ème"],
-            default=["18ème", "19ème"]
+            list(SIECLES),
+            default=DEFAULT_SIECLES
         )
         
         # Options d'affichage
@@ -539,6 +371,46 @@ class HistoricalPeriodicTableDashboard:
             'group_by_epoch': group_by_epoch
         }
     
+    def create_performance_panel(self):
+        """Affiche les mesures de l'instrumentation (DASHBOARD_PROFILE), par session et par processus"""
+        st.markdown('<h3 class="section-header">⏱️ PERFORMANCE</h3>', unsafe_allow_html=True)
+        session = st.session_state.setdefault('profil', {})
+        st.caption(f"Instrumentation '{PROFILE_MODE}', {PROFILER.reruns} reruns mesurés par le processus; "
+                   f"durées inclusives sur les {PROFILER.window} derniers reruns")
+        
+        for title, rows in (("Session", PROFILER.summary(session)), ("Processus", PROFILER.summary())):
+            st.markdown(f"#### {title}")
+            if rows:
+                st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+            else:
+                st.info("Aucun rerun mesuré pour l'instant.")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Exporter en JSON", PROFILER.to_json(session),
+                               file_name="performance.json", mime="application/json")
+        with col2:
+            st.download_button("Exporter pour Prometheus", PROFILER.to_prometheus(),
+                               file_name="performance.prom", mime="text/plain")
+    
+    def display_debug_panel(self):
+        """Affiche le coût des imports mesuré au démarrage du processus"""
+        total_ms = total_import_ms()
+        with st.sidebar.expander("🐞 Débogage: imports", expanded=False):
+            if total_ms > IMPORT_BUDGET_MS:
+                st.warning(f"Démarrage à {total_ms:.0f} ms, budget de {IMPORT_BUDGET_MS:.0f} ms dépassé")
+            else:
+                st.caption(f"Démarrage à {total_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+            refresher = catalog_refresher()
+            refreshed = (time.strftime('%H:%M:%S', time.localtime(refresher.refreshed_at))
+                         if refresher.refreshed_at else "jamais")
+            st.caption(f"Catalogue {self.catalog.version} ({refresher.source.name}), actualisé: {refreshed}")
+            if refresher.last_error:
+                st.warning(f"Dernière actualisation en échec: {refresher.last_error}")
+            rows = "\n".join(f"| {row['module']} | {row['ms']:.1f} | {row['trigger']} |"
+                             for row in import_report())
+            st.markdown("| Module | ms | Chargement |\n|---|---:|---|\n" + rows)
+    
     def run_dashboard(self):
         """Exécute le dashboard complet"""
         # Sidebar
@@ -547,29 +419,53 @@ class HistoricalPeriodicTableDashboard:
         # Header
         self.display_header()
         
+        # Éléments retenus par le filtre temporel, transmis à chaque vue
+        selection = self.select_elements(controls['siecles'])
+        
         # Navigation principale
-        if controls['section'] == "Frise Chronologique":
-            self.create_timeline_view()
-            self.create_epoch_overview()
+        if controls['section'] == "Identification Spectrale":
+            self.create_reverse_search()
+        elif controls['section'] == "Performance":
+            self.create_performance_panel()
+        elif not selection.any():
+            st.warning("Aucun élément découvert dans les siècles sélectionnés.")
+        elif controls['section'] == "Frise Chronologique":
+            self.create_timeline_view(selection)
+            self.create_epoch_overview(selection)
         elif controls['section'] == "Vue par Époque":
-            self.create_epoch_overview()
+            self.create_epoch_overview(selection)
         elif controls['section'] == "Analyse Spectrale":
-            self.create_spectral_rgb_analysis()
-            self.create_epoch_overview()
+            self.create_spectral_rgb_analysis(selection)
+            self.create_epoch_overview(selection)
         elif controls['section'] == "Explorateur":
-            self.create_spectral_explorer()
+            self.create_spectral_explorer(selection)
+            self.create_line_search()
+        elif controls['section'] == "Comparaison":
+            self.create_comparison_view(selection)
         
         # Footer
         st.markdown("---")
-        st.markdown("""
-        <div style='text-align: center; color: #666;'>
-        <strong>Tableau Périodique Historique avec Spectres RGB</strong><br>
-        Classification des éléments par date de découverte et analyse de leurs signatures spectrales caractéristiques<br>
-        Données historiques et spectrales compilées pour l'étude de l'évolution de la chimie
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(FOOTER_HTML, unsafe_allow_html=True)
+        
+        # Rapport de démarrage, visible avec ?debug=1
+        if st.query_params.get('debug'):
+            self.display_debug_panel()
+
+def warm_view_caches(catalog):
+    """Prépare hors requête une nouvelle version du catalogue: spectres et vues par défaut"""
+    dashboard = HistoricalPeriodicTableDashboard(catalog=catalog)
+    dashboard.spectra.spectra(dashboard.columns.symbols.tolist(), SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH)
+    for siecles in (DEFAULT_SIECLES, []):
+        dashboard.prepare_views(dashboard.select_elements(siecles))
+
+# Instrumentation des vues, si DASHBOARD_PROFILE est défini (constructions de figures: views.py)
+if PROFILER.enabled:
+    load_catalog = PROFILER.wrap('load_catalog', load_catalog)
+PROFILER.instrument(HistoricalPeriodicTableDashboard,
+                    lambda name: name.startswith(('create_', 'select_', 'display_', 'run_')))
 
 # Lancement du dashboard
 if __name__ == "__main__":
-    dashboard = HistoricalPeriodicTableDashboard()
-    dashboard.run_dashboard()
\ No newline at end of file
+    with PROFILER.rerun(st.session_state.setdefault('profil', {})):
+        dashboard = HistoricalPeriodicTableDashboard()
+        dashboard.run_dashboard()
\ No newline at end of file
@@ -0,0 +1,424 @@
+"""Mesures de performance du dashboard
+
+Usage:
+    python benchmark.py [--reruns 1000]
+    python benchmark.py --views [--sizes 40 118 10000] [--json rapport.json] [--compare ancien.json]
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from catalog import (ElementCatalog, build_catalog, define_elements_with_discovery_dates,
+                     define_historical_epochs, define_spectral_rgb_data)
+
+
+def synthetic_catalog(size, seed=0):
+    """Catalogue de taille arbitraire: les éléments réels, complétés par des éléments fictifs"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    elements = define_elements_with_discovery_dates()[:size]
+    epochs = define_historical_epochs()
+    spectral = define_spectral_rgb_data()
+    for i in range(len(elements), size):
+        epoch = epochs[i % len(epochs)]
+        symbole = f'X{i}'
+        elements.append({
+            'symbole': symbole, 'nom': f'Élément {i}',
+            'date_decouverte': int(rng.integers(-3000, 2020)),
+            'decouvreur': f'Découvreur {i % 97}', 'periode_epoch': epoch['nom']
+        })
+        if i % 3 == 0:
+            wavelength = round(float(rng.uniform(380, 780)), 1)
+            spectral[symbole] = {'longueur_onde_principale': wavelength, 'raies': [f'{wavelength} nm']}
+    return ElementCatalog(elements, epochs, spectral)
+
+
+@functools.lru_cache(maxsize=None)
+def shared_synthetic_catalog(size):
+    """Catalogue synthétique construit une fois par taille, réutilisé par les reruns AppTest"""
+    return synthetic_catalog(size)
+
+
+def count_deltas(node):
+    """Nombre d'éléments et de blocs émis vers le navigateur sous un nœud AppTest"""
+    children = getattr(node, 'children', {})
+    return len(children) + sum(count_deltas(child) for child in children.values())
+
+
+def payload_bytes(node):
+    """Taille sérialisée (protobuf) des éléments émis sous un nœud AppTest"""
+    total = 0
+    for child in getattr(node, 'children', {}).values():
+        proto = getattr(child, 'proto', None)
+        if proto is not None and hasattr(proto, 'ByteSize'):
+            total += proto.ByteSize()
+        total += payload_bytes(child)
+    return total
+
+
+def _epoch_overview_script(size):
+    import streamlit as st
+    import benchmark
+    from Dashboard import HistoricalPeriodicTableDashboard
+    dashboard = HistoricalPeriodicTableDashboard(catalog=benchmark.synthetic_catalog(size))
+    # Conteneur propre à la vue: le CSS émis à l'import de Dashboard n'est pas compté
+    with st.container():
+        dashboard.create_epoch_overview()
+
+
+def bench_epoch_overview_deltas(size):
+    """Nombre de deltas émis par la grille des époques pour un catalogue de taille donnée"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_function(_epoch_overview_script, args=(size,), default_timeout=60)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return count_deltas(list(at.main.children.values())[-1])
+
+
+def _dashboard_script(size):
+    import benchmark
+    from Dashboard import HistoricalPeriodicTableDashboard
+    HistoricalPeriodicTableDashboard(catalog=benchmark.shared_synthetic_catalog(size)).run_dashboard()
+
+
+def _timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    return elapsed_ms
+
+
+def bench_views(size):
+    """Coût de chaque section de la sidebar, exécutée sans navigateur par AppTest
+
+    Pour chaque section: durée du premier affichage (caches de figures et de fragments vides) et
+    d'un rerun, deltas et octets émis, pic de mémoire allouée au premier affichage.
+    """
+    from streamlit.testing.v1 import AppTest
+    from figures import FIGURE_CACHE, FRAGMENT_CACHE
+
+    at = AppTest.from_function(_dashboard_script, args=(size,), default_timeout=600)
+    _timed_run(at)
+    results = []
+    for section in at.sidebar.radio[0].options:
+        at.sidebar.radio[0].set_value(section)
+        FIGURE_CACHE.clear()
+        FRAGMENT_CACHE.clear()
+        first_ms = _timed_run(at)
+        rerun_ms = _timed_run(at)
+        deltas = count_deltas(at.main) + count_deltas(at.sidebar)
+        nbytes = payload_bytes(at.main) + payload_bytes(at.sidebar)
+
+        # Mesure mémoire séparée: tracemalloc ralentit l'exécution
+        FIGURE_CACHE.clear()
+        FRAGMENT_CACHE.clear()
+        tracemalloc.start()
+        try:
+            _timed_run(at)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        results.append({
+            'size': size, 'section': section, 'first_ms': round(first_ms, 2), 'rerun_ms': round(rerun_ms, 2),
+            'deltas': deltas, 'payload_bytes': nbytes, 'peak_kib': round(peak / 1024, 1),
+        })
+    return results
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def views_report(sizes):
+    """Rapport de la suite des vues, enregistrable en JSON pour comparer deux commits"""
+    import streamlit
+
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'streamlit': streamlit.__version__,
+        'views': [row for size in sizes for row in bench_views(size)],
+    }
+
+
+VIEW_METRICS = ('first_ms', 'rerun_ms', 'deltas', 'payload_bytes', 'peak_kib')
+
+
+def print_views(report, baseline=None):
+    """Tableau des mesures, avec le rapport entre les deux commits si un rapport de référence est donné"""
+    previous = {(row['size'], row['section']): row for row in (baseline or {}).get('views', [])}
+    print(f"{'Taille':>6}  {'Section':<24}" + "".join(f"{metric:>16}" for metric in VIEW_METRICS))
+    for row in report['views']:
+        line = f"{row['size']:>6}  {row['section']:<24}"
+        old = previous.get((row['size'], row['section']))
+        for metric in VIEW_METRICS:
+            cell = f"{row[metric]:g}"
+            if old and old[metric]:
+                cell += f" ×{row[metric] / old[metric]:.2f}"
+            line += f"{cell:>16}"
+        print(line)
+
+
+def _time_per_call(func, repeat):
+    """Durée moyenne d'un appel, en microsecondes"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_catalog_startup(reruns):
+    """Compare la construction du catalogue à chaque rerun et le catalogue partagé"""
+    from Dashboard import HistoricalPeriodicTableDashboard
+
+    start = time.perf_counter()
+    shared = build_catalog()
+    startup_us = (time.perf_counter() - start) * 1e6
+
+    rebuilt_us = _time_per_call(
+        lambda: HistoricalPeriodicTableDashboard(catalog=build_catalog()), reruns)
+    shared_us = _time_per_call(
+        lambda: HistoricalPeriodicTableDashboard(catalog=shared), reruns)
+
+    return {
+        'startup_us': startup_us,
+        'rerun_rebuilt_us': rebuilt_us,
+        'rerun_shared_us': shared_us,
+    }
+
+
+def bench_cold_import(mode):
+    """Durée d'import de Dashboard.py dans un processus neuf, en millisecondes"""
+    code = "import time; t = time.perf_counter(); import Dashboard; print((time.perf_counter() - t) * 1000)"
+    env = dict(os.environ, DASHBOARD_IMPORT_MODE=mode)
+    result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def bench_spectra(size, resolution=400):
+    """Génération des spectres de tout le catalogue: premier calcul puis second lot (ms), et part
+    des spectres du lot (éléments avec raies) conservés dans le cache après le premier calcul"""
+    catalog = synthetic_catalog(size)
+    engine = catalog.spectra
+    symbols = list(catalog.index.by_symbol)
+    start = time.perf_counter()
+    engine.spectra(symbols, resolution)
+    first_ms = (time.perf_counter() - start) * 1000
+    with_lines = [symb for symb in symbols if symb in engine.lines]
+    kept = sum((symb, resolution, 10.0) in engine._cache for symb in with_lines)
+    start = time.perf_counter()
+    engine.spectra(symbols, resolution)
+    return first_ms, (time.perf_counter() - start) * 1000, kept, len(with_lines)
+
+
+def bench_recolor(size):
+    """Recoloration de tout le catalogue à partir de spectres déjà calculés (ms)"""
+    catalog = synthetic_catalog(size)
+    symbols = list(catalog.spectral_data)
+    spectra = catalog.spectra.spectra(symbols, catalog.colors.resolution)
+    start = time.perf_counter()
+    catalog.colors.spectra_to_rgb(spectra)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_line_queries(size, repeat=100):
+    """Requêtes sur une base de raies synthétique: fenêtre de 5 nm et tracé complet (µs)"""
+    import numpy as np
+    from line_database import LineDatabase
+
+    rng = np.random.default_rng(0)
+    db = LineDatabase.from_arrays(rng.choice([f'X{i}' for i in range(118)], size),
+                                  rng.uniform(200, 1000, size).astype(np.float32),
+                                  rng.random(size).astype(np.float32))
+    window_us = _time_per_call(lambda: db.elements_in_window(585, 590), repeat)
+    plot_us = _time_per_call(lambda: db.binned_intensity(200, 1000, 800), repeat)
+    return window_us, plot_us
+
+
+def bench_figure_cache(size, repeat=20):
+    """Frise et palette: construction à chaque rerun ou lecture du cache de figures (ms)"""
+    from Dashboard import HistoricalPeriodicTableDashboard, selection_key
+    from figures import RenderCache
+
+    dashboard = HistoricalPeriodicTableDashboard(catalog=synthetic_catalog(size))
+    cache = RenderCache()
+    build = lambda: dashboard.build_timeline_figure()
+    rebuilt_ms = _time_per_call(lambda: RenderCache().get(('timeline', None, 'v'), build), repeat) / 1000
+    cached_ms = _time_per_call(lambda: cache.get(('timeline', selection_key(None), 'v'), build), repeat) / 1000
+    return rebuilt_ms, cached_ms
+
+
+def bench_timeline(size, axis='signed'):
+    """Frise de nombreuses découvertes: temps de construction (ms) et taille de son rendu HTML (octets)"""
+    from Dashboard import HistoricalPeriodicTableDashboard
+    from figures import CachedFigure
+
+    dashboard = HistoricalPeriodicTableDashboard(catalog=synthetic_catalog(size))
+    build_ms = _time_per_call(lambda: dashboard.build_timeline_figure(axis=axis), 5) / 1000
+    return build_ms, CachedFigure(dashboard.build_timeline_figure(axis=axis)).nbytes
+
+
+def bench_playback(size):
+    """Animation des découvertes: construction (ms), nombre d'images et taille de son rendu HTML (octets)"""
+    from Dashboard import HistoricalPeriodicTableDashboard
+    from figures import CachedFigure
+
+    dashboard = HistoricalPeriodicTableDashboard(catalog=synthetic_catalog(size))
+    build_ms = _time_per_call(dashboard.build_playback_figure, 5) / 1000
+    fig = dashboard.build_playback_figure()
+    return build_ms, len(fig.frames), CachedFigure(fig).nbytes
+
+
+def bench_comparison(size):
+    """Comparaison de tout le catalogue: recouvrements (un produit matriciel) et superposition (ms)"""
+    from Dashboard import HistoricalPeriodicTableDashboard
+
+    dashboard = HistoricalPeriodicTableDashboard(catalog=synthetic_catalog(size))
+    symbols = dashboard.columns.symbols.tolist()
+    overlaps_ms = _time_per_call(lambda: dashboard.compute_overlaps(symbols), 5) / 1000
+    figure_ms = _time_per_call(lambda: dashboard.build_comparison_figure(symbols), 5) / 1000
+    return overlaps_ms, figure_ms
+
+
+def _element_rows(size):
+    """Lignes d'éléments aux chaînes toutes distinctes, comme à la lecture d'un fichier"""
+    epochs = [epoch['nom'] for epoch in define_historical_epochs()]
+    for i in range(size):
+        yield {
+            'symbole': f'X{i}', 'nom': f'Élément {i}', 'date_decouverte': 1000 + i % 1000,
+            'decouvreur': f'Découvreur {i % 97}', 'periode_epoch': ''.join(epochs[i % len(epochs)]),
+        }
+
+
+def _spectral_rows(size):
+    for i in range(size):
+        wavelength = 380 + (i % 4000) / 10
+        yield {'longueur_onde_principale': wavelength,
+               'raies': [f'{wavelength:.1f} nm', f'{wavelength + 1:.1f} nm (raie {i % 7})']}
+
+
+def _retained_bytes(build):
+    """Mémoire allouée par build() et encore retenue par son résultat"""
+    tracemalloc.start()
+    try:
+        result = build()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def bench_record_memory(size=10000):
+    """Mémoire retenue par size enregistrements: dicts figés (ancienne forme) et enregistrements à __slots__ (Kio)"""
+    from types import MappingProxyType
+    from records import Element, SpectralInfo
+
+    results = {}
+    results['elements_dict'] = _retained_bytes(
+        lambda: tuple(MappingProxyType(dict(row)) for row in _element_rows(size)))
+    results['elements_records'] = _retained_bytes(
+        lambda: tuple(map(Element.from_mapping, _element_rows(size))))
+    results['spectral_dict'] = _retained_bytes(lambda: tuple(
+        MappingProxyType({'longueur_onde_principale': row['longueur_onde_principale'],
+                          'raies': tuple(row['raies'])}) for row in _spectral_rows(size)))
+    results['spectral_records'] = _retained_bytes(
+        lambda: tuple(map(SpectralInfo.from_mapping, _spectral_rows(size))))
+    return {key: value / 1024 for key, value in results.items()}
+
+
+SEARCH_QUERIES = ('helium', 'Jâbir', 'decouvrer', 'element 42', 'moderne', '656,3', 'xyzzy')
+
+
+def bench_search(size, repeat=200):
+    """Recherche plein texte: construction de l'index (ms) et pire durée moyenne d'une requête (µs)"""
+    from search import SearchIndex
+
+    catalog = synthetic_catalog(size)
+    start = time.perf_counter()
+    SearchIndex(catalog.elements_data, catalog.spectral_data)
+    build_ms = (time.perf_counter() - start) * 1000
+    query_us = max(_time_per_call(lambda: catalog.search.find(query), repeat) for query in SEARCH_QUERIES)
+    return build_ms, query_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reruns', type=int, default=1000,
+                        help="nombre de reruns simulés")
+    parser.add_argument('--views', action='store_true',
+                        help="mesurer chaque section du dashboard avec AppTest")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[40, 118, 10000],
+                        help="tailles du catalogue synthétique pour --views")
+    parser.add_argument('--json', metavar='FICHIER', help="enregistrer le rapport de --views en JSON")
+    parser.add_argument('--compare', metavar='FICHIER', help="rapport JSON de référence pour --views")
+    args = parser.parse_args()
+
+    if args.views:
+        report = views_report(args.sizes)
+        baseline = None
+        if args.compare:
+            with open(args.compare, encoding='utf-8') as f:
+                baseline = json.load(f)
+            print(f"Référence: commit {baseline.get('commit')}, actuel: commit {report['commit']}")
+        print_views(report, baseline)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        return
+
+    results = bench_catalog_startup(args.reruns)
+    print(f"Construction initiale du catalogue : {results['startup_us']:10.1f} µs")
+    print(f"Rerun avec reconstruction          : {results['rerun_rebuilt_us']:10.1f} µs")
+    print(f"Rerun avec catalogue partagé       : {results['rerun_shared_us']:10.1f} µs")
+    for size in (40, 118):
+        print(f"Deltas de la grille ({size:3} éléments) : {bench_epoch_overview_deltas(size):10d}")
+    for size in (118, 10000):
+        first_ms, second_ms, kept, with_lines = bench_spectra(size)
+        print(f"Spectres ({size:5} éléments)         : {first_ms:10.1f} ms, second lot {second_ms:.1f} ms "
+              f"({kept}/{with_lines} spectres en cache)")
+        print(f"Recoloration ({size:5} éléments)     : {bench_recolor(size):10.1f} ms")
+    window_us, plot_us = bench_line_queries(500000)
+    print(f"Raies (500000), fenêtre 585-590 nm  : {window_us:10.1f} µs, tracé complet {plot_us:.1f} µs")
+    for size in (118, 10000):
+        rebuilt_ms, cached_ms = bench_figure_cache(size)
+        print(f"Frise ({size:5} éléments)            : {rebuilt_ms:10.1f} ms, {cached_ms:.3f} ms en cache")
+    memory = bench_record_memory(10000)
+    print(f"Éléments (10000), mémoire retenue   : {memory['elements_dict']:10.0f} Kio en dicts, "
+          f"{memory['elements_records']:.0f} Kio en enregistrements")
+    print(f"Spectres (10000), mémoire retenue   : {memory['spectral_dict']:10.0f} Kio en dicts, "
+          f"{memory['spectral_records']:.0f} Kio en enregistrements")
+    build_ms, frames, nbytes = bench_playback(118)
+    print(f"Lecture animée (118 éléments)       : {build_ms:10.1f} ms, {frames} images, {nbytes / 1024:.0f} Kio de HTML")
+    overlaps_ms, figure_ms = bench_comparison(118)
+    print(f"Comparaison (118 éléments)          : {overlaps_ms:10.1f} ms, superposition {figure_ms:.1f} ms")
+    for size in (118, 10000):
+        build_ms, query_us = bench_search(size)
+        print(f"Recherche ({size:5} éléments)        : {query_us:10.1f} µs par requête, index en {build_ms:.0f} ms")
+    for axis in ('signed', 'log'):
+        build_ms, nbytes = bench_timeline(50000, axis)
+        print(f"Frise (50000 événements, {axis:6})    : {build_ms:10.1f} ms, {nbytes / 1024:.0f} Kio de HTML")
+    for mode in ('lazy', 'eager'):
+        print(f"Import à froid ({mode:5})             : {bench_cold_import(mode):10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
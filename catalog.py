@@ -0,0 +1,363 @@
+"""Catalogue historique des éléments, partagé par toutes les sessions du serveur"""
+import hashlib
+import json
+from types import MappingProxyType
+
+import numpy as np
+
+from line_database import LineDatabase
+from records import Element, Epoch, SpectralInfo, _intern, _plain
+from search import SearchIndex
+from spectral import SpectralEngine, default_color_engine
+
+
+def define_historical_epochs():
+    """Définit les périodes historiques de découverte"""
+    return [
+        {
+            'nom': 'Antiquité', 'periode': 'Avant 500', 'couleur': '#F5DEB3',
+            'description': 'Éléments connus depuis l\'antiquité',
+            'elements': ['C', 'S', 'Fe', 'Cu', 'Ag', 'Sn', 'Au', 'Hg', 'Pb']
+        },
+        {
+            'nom': 'Moyen-Âge', 'periode': '500-1500', 'couleur': '#DEB887',
+            'description': 'Éléments découverts au Moyen-Âge',
+            'elements': ['As', 'Sb', 'Bi', 'Zn']
+        },
+        {
+            'nom': 'Renaissance', 'periode': '1500-1700', 'couleur': '#F4A460',
+            'description': 'Découvertes de la Renaissance',
+            'elements': ['P', 'Co', 'Ni', 'Pt']
+        },
+        {
+            'nom': 'Révolution Chimique', 'periode': '1700-1800', 'couleur': '#CD853F',
+            'description': 'Période de la révolution chimique',
+            'elements': ['H', 'N', 'O', 'Cl', 'Mn', 'Mo', 'Te', 'Cr', 'W', 'U', 'Ti', 'Be']
+        },
+        {
+            'nom': 'Ère Spectroscopique', 'periode': '1800-1900', 'couleur': '#D2691E',
+            'description': 'Découvertes par spectroscopie',
+            'elements': ['Li', 'Na', 'K', 'Rb', 'Cs', 'Ca', 'Sr', 'Ba', 'B', 'Al', 'Si', 'Se', 'Br', 'I', 'He', 'Ne', 'Ar', 'Kr', 'Xe']
+        },
+        {
+            'nom': 'Période Moderne', 'periode': '1900-Aujourd\'hui', 'couleur': '#A0522D',
+            'description': 'Éléments découverts au 20ème siècle',
+            'elements': ['Ra', 'Rn', 'Fr', 'Tc', 'Pm', 'Tous les actinides']
+        }
+    ]
+
+
+def define_elements_with_discovery_dates():
+    """Définit les éléments avec leurs dates de découverte"""
+    return [
+        # Éléments antiques
+        {'symbole': 'C', 'nom': 'Carbone', 'date_decouverte': -25000, 'decouvreur': 'Préhistoire', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'S', 'nom': 'Soufre', 'date_decouverte': -2000, 'decouvreur': 'Chinois anciens', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Fe', 'nom': 'Fer', 'date_decouverte': -1500, 'decouvreur': 'Hittites', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Cu', 'nom': 'Cuivre', 'date_decouverte': -9000, 'decouvreur': 'Moyen-Orient', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Ag', 'nom': 'Argent', 'date_decouverte': -3000, 'decouvreur': 'Mésopotamiens', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Sn', 'nom': 'Étain', 'date_decouverte': -2000, 'decouvreur': 'Civilisations anciennes', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Au', 'nom': 'Or', 'date_decouverte': -6000, 'decouvreur': 'Égyptiens', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Hg', 'nom': 'Mercure', 'date_decouverte': -1500, 'decouvreur': 'Chinois/Égyptiens', 'periode_epoch': 'Antiquité'},
+        {'symbole': 'Pb', 'nom': 'Plomb', 'date_decouverte': -3000, 'decouvreur': 'Mésopotamiens', 'periode_epoch': 'Antiquité'},
+
+        # Moyen-Âge
+        {'symbole': 'As', 'nom': 'Arsenic', 'date_decouverte': 1250, 'decouvreur': 'Albert le Grand', 'periode_epoch': 'Moyen-Âge'},
+        {'symbole': 'Sb', 'nom': 'Antimoine', 'date_decouverte': 800, 'decouvreur': 'Jâbir ibn Hayyân', 'periode_epoch': 'Moyen-Âge'},
+        {'symbole': 'Bi', 'nom': 'Bismuth', 'date_decouverte': 1400, 'decouvreur': 'Inconnu', 'periode_epoch': 'Moyen-Âge'},
+        {'symbole': 'Zn', 'nom': 'Zinc', 'date_decouverte': 1000, 'decouvreur': 'Indiens', 'periode_epoch': 'Moyen-Âge'},
+
+        # Renaissance
+        {'symbole': 'P', 'nom': 'Phosphore', 'date_decouverte': 1669, 'decouvreur': 'H. Brand', 'periode_epoch': 'Renaissance'},
+        {'symbole': 'Co', 'nom': 'Cobalt', 'date_decouverte': 1735, 'decouvreur': 'G. Brandt', 'periode_epoch': 'Renaissance'},
+        {'symbole': 'Ni', 'nom': 'Nickel', 'date_decouverte': 1751, 'decouvreur': 'A. F. Cronstedt', 'periode_epoch': 'Renaissance'},
+        {'symbole': 'Pt', 'nom': 'Platine', 'date_decouverte': 1557, 'decouvreur': 'J. C. Scaliger', 'periode_epoch': 'Renaissance'},
+
+        # Révolution Chimique
+        {'symbole': 'H', 'nom': 'Hydrogène', 'date_decouverte': 1766, 'decouvreur': 'H. Cavendish', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'N', 'nom': 'Azote', 'date_decouverte': 1772, 'decouvreur': 'D. Rutherford', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'O', 'nom': 'Oxygène', 'date_decouverte': 1774, 'decouvreur': 'J. Priestley', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'Cl', 'nom': 'Chlore', 'date_decouverte': 1774, 'decouvreur': 'C. W. Scheele', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'Mn', 'nom': 'Manganèse', 'date_decouverte': 1774, 'decouvreur': 'J. G. Gahn', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'Cr', 'nom': 'Chrome', 'date_decouverte': 1797, 'decouvreur': 'L. N. Vauquelin', 'periode_epoch': 'Révolution Chimique'},
+        {'symbole': 'U', 'nom': 'Uranium', 'date_decouverte': 1789, 'decouvreur': 'M. H. Klaproth', 'periode_epoch': 'Révolution Chimique'},
+
+        # Ère Spectroscopique
+        {'symbole': 'Li', 'nom': 'Lithium', 'date_decouverte': 1817, 'decouvreur': 'J. A. Arfwedson', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Na', 'nom': 'Sodium', 'date_decouverte': 1807, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'K', 'nom': 'Potassium', 'date_decouverte': 1807, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Rb', 'nom': 'Rubidium', 'date_decouverte': 1861, 'decouvreur': 'R. Bunsen, G. Kirchhoff', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Cs', 'nom': 'Césium', 'date_decouverte': 1860, 'decouvreur': 'R. Bunsen, G. Kirchhoff', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Ca', 'nom': 'Calcium', 'date_decouverte': 1808, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Sr', 'nom': 'Strontium', 'date_decouverte': 1790, 'decouvreur': 'A. Crawford', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Ba', 'nom': 'Baryum', 'date_decouverte': 1808, 'decouvreur': 'H. Davy', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'He', 'nom': 'Hélium', 'date_decouverte': 1868, 'decouvreur': 'P. Janssen, J. N. Lockyer', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Ne', 'nom': 'Néon', 'date_decouverte': 1898, 'decouvreur': 'W. Ramsay, M. Travers', 'periode_epoch': 'Ère Spectroscopique'},
+        {'symbole': 'Ar', 'nom': 'Argon', 'date_decouverte': 1894, 'decouvreur': 'Lord Rayleigh, W. Ramsay', 'periode_epoch': 'Ère Spectroscopique'},
+
+        # Période Moderne
+        {'symbole': 'Ra', 'nom': 'Radium', 'date_decouverte': 1898, 'decouvreur': 'P. et M. Curie', 'periode_epoch': 'Période Moderne'},
+        {'symbole': 'Rn', 'nom': 'Radon', 'date_decouverte': 1900, 'decouvreur': 'F. E. Dorn', 'periode_epoch': 'Période Moderne'},
+        {'symbole': 'Fr', 'nom': 'Francium', 'date_decouverte': 1939, 'decouvreur': 'M. Perey', 'periode_epoch': 'Période Moderne'},
+        {'symbole': 'Tc', 'nom': 'Technétium', 'date_decouverte': 1937, 'decouvreur': 'C. Perrier, E. Segrè', 'periode_epoch': 'Période Moderne'}
+    ]
+
+
+def define_spectral_rgb_data():
+    """Définit les données spectrales RGB pour chaque élément"""
+    return {
+        # Spectres rouges caractéristiques
+        'Li': {'longueur_onde_principale': 670.8, 'raies': ['670.8 nm']},
+        'Rb': {'longueur_onde_principale': 780.0, 'raies': ['780.0 nm', '794.8 nm']},
+        'Sr': {'longueur_onde_principale': 460.7, 'raies': ['460.7 nm']},
+
+        # Spectres verts caractéristiques
+        'Tl': {'longueur_onde_principale': 535.0, 'raies': ['535.0 nm']},
+        'Ba': {'longueur_onde_principale': 553.5, 'raies': ['553.5 nm']},
+        'Cu': {'longueur_onde_principale': 521.8, 'raies': ['521.8 nm']},
+
+        # Spectres bleus caractéristiques
+        'Cs': {'longueur_onde_principale': 455.5, 'raies': ['455.5 nm']},
+        'Hg': {'longueur_onde_principale': 435.8, 'raies': ['435.8 nm']},
+        'As': {'longueur_onde_principale': 450.0, 'raies': ['450.0 nm']},
+
+        # Spectres mixtes
+        'Na': {'longueur_onde_principale': 589.0, 'raies': ['589.0 nm', '589.6 nm']},
+        'K': {'longueur_onde_principale': 766.5, 'raies': ['766.5 nm', '769.9 nm']},
+        'H': {'longueur_onde_principale': 656.3, 'raies': ['656.3 nm (Hα)', '486.1 nm (Hβ)']},
+        'He': {'longueur_onde_principale': 587.6, 'raies': ['587.6 nm']},
+        'Ne': {'longueur_onde_principale': 640.2, 'raies': ['640.2 nm']}
+    }
+
+
+# Couleur par défaut basée sur la période de découverte
+EPOCH_DEFAULT_RGB = {
+    'Antiquité': (245, 222, 179),
+    'Moyen-Âge': (222, 184, 135),
+    'Renaissance': (244, 164, 96),
+    'Révolution Chimique': (205, 133, 63),
+    'Ère Spectroscopique': (210, 105, 30),
+    'Période Moderne': (160, 82, 45)
+}
+DEFAULT_RGB = (200, 200, 200)  # Gris par défaut
+
+
+# Symboles par numéro atomique (1 à 118)
+PERIODIC_SYMBOLS = (
+    'H', 'He', 'Li', 'Be', 'B', 'C', 'N', 'O', 'F', 'Ne', 'Na', 'Mg', 'Al', 'Si', 'P', 'S', 'Cl', 'Ar',
+    'K', 'Ca', 'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn', 'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr',
+    'Rb', 'Sr', 'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd', 'In', 'Sn', 'Sb', 'Te', 'I', 'Xe',
+    'Cs', 'Ba', 'La', 'Ce', 'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb', 'Lu',
+    'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg', 'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn',
+    'Fr', 'Ra', 'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm', 'Md', 'No', 'Lr',
+    'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og',
+)
+_PERIOD_STARTS = (1, 3, 11, 19, 37, 55, 87)
+TABLE_COLUMNS = 18
+
+
+def periodic_position(atomic_number):
+    """(ligne, colonne) dans le tableau à 18 colonnes; lanthanides et actinides en lignes 9 et 10"""
+    z = atomic_number
+    if 57 <= z <= 71:
+        return 9, z - 54
+    if 89 <= z <= 103:
+        return 10, z - 86
+    period = sum(start <= z for start in _PERIOD_STARTS)
+    offset = z - _PERIOD_STARTS[period - 1]
+    if period == 1:
+        return 1, 1 if z == 1 else TABLE_COLUMNS
+    if period in (2, 3) and offset >= 2:
+        return period, offset + 11
+    if period in (6, 7) and offset >= 2:
+        return period, offset - 13
+    return period, offset + 1
+
+
+def periodic_positions(symbols):
+    """Lignes et colonnes du tableau pour des symboles; les symboles inconnus suivent, ligne par ligne"""
+    numbers = {symb: z for z, symb in enumerate(PERIODIC_SYMBOLS, start=1)}
+    rows, cols = np.empty(len(symbols), dtype=np.int16), np.empty(len(symbols), dtype=np.int16)
+    extra = 0
+    for i, symb in enumerate(symbols):
+        if symb in numbers:
+            rows[i], cols[i] = periodic_position(numbers[symb])
+        else:
+            rows[i], cols[i] = 12 + extra // TABLE_COLUMNS, 1 + extra % TABLE_COLUMNS
+            extra += 1
+    return rows, cols
+
+
+def rgb_to_hex(rgb):
+    """Convertit un triplet RGB en couleur hexadécimale"""
+    return f'#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}'
+
+
+class CatalogIndex:
+    """Index précalculés: symbole → élément, symbole → couleur"""
+
+    __slots__ = ('by_symbol', 'rgb', 'hex')
+
+    def __init__(self, elements_data, spectral_rgb):
+        self.by_symbol = MappingProxyType({e.symbole: e for e in elements_data})
+
+        # Couleur résolue une fois pour chaque symbole connu: spectre calculé, sinon couleur d'époque
+        rgb = {}
+        for element in elements_data:
+            rgb[element.symbole] = EPOCH_DEFAULT_RGB.get(element.periode_epoch, DEFAULT_RGB)
+        rgb.update(spectral_rgb)
+        self.rgb = MappingProxyType(rgb)
+        self.hex = MappingProxyType({symb: rgb_to_hex(value) for symb, value in rgb.items()})
+
+    def element_rgb(self, element_symb):
+        return self.rgb.get(element_symb, DEFAULT_RGB)
+
+    def element_hex(self, element_symb):
+        return self.hex.get(element_symb) or rgb_to_hex(DEFAULT_RGB)
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+class ElementColumns:
+    """Stockage en colonnes NumPy des éléments, pour les requêtes vectorisées"""
+
+    __slots__ = ('symbols', 'names', 'discoverers', 'years', 'epoch_names', 'epoch_codes',
+                 'rgb', 'wavelength', 'has_spectrum', 'year_order', 'sorted_years')
+
+    def __init__(self, elements_data, epochs_data, spectral_data, index):
+        # Les époques déclarées gardent leur ordre; les époques inconnues sont ajoutées à la fin
+        epoch_names = [epoch.nom for epoch in epochs_data]
+        for element in elements_data:
+            if element.periode_epoch not in epoch_names:
+                epoch_names.append(element.periode_epoch)
+        epoch_code = {nom: code for code, nom in enumerate(epoch_names)}
+
+        self.symbols = _readonly(np.array([e.symbole for e in elements_data], dtype=object))
+        self.names = _readonly(np.array([e.nom for e in elements_data], dtype=object))
+        self.discoverers = _readonly(np.array([e.decouvreur for e in elements_data], dtype=object))
+        self.years = _readonly(np.array([e.date_decouverte for e in elements_data], dtype=np.int32))
+        self.epoch_names = _readonly(np.array(epoch_names, dtype=object))
+        self.epoch_codes = _readonly(np.array(
+            [epoch_code[e.periode_epoch] for e in elements_data], dtype=np.int16))
+        self.rgb = _readonly(np.array(
+            [index.element_rgb(e.symbole) for e in elements_data], dtype=np.uint8).reshape(-1, 3))
+        self.wavelength = _readonly(np.array(
+            [spectral_data[e.symbole].longueur_onde_principale if e.symbole in spectral_data
+             else np.nan for e in elements_data], dtype=np.float32))
+        self.has_spectrum = _readonly(~np.isnan(self.wavelength))
+
+        # Index trié des années, pour les requêtes par intervalle (recherche dichotomique)
+        self.year_order = _readonly(np.argsort(self.years, kind='stable'))
+        self.sorted_years = _readonly(self.years[self.year_order])
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _select(self, mask):
+        return np.ones(len(self), dtype=bool) if mask is None else mask
+
+    def mask_year_ranges(self, ranges):
+        """Masque des éléments découverts dans l'un des intervalles [start, end)"""
+        mask = np.zeros(len(self), dtype=bool)
+        for start, end in ranges:
+            lo = 0 if start is None else np.searchsorted(self.sorted_years, start, side='left')
+            hi = len(self) if end is None else np.searchsorted(self.sorted_years, end, side='left')
+            mask[self.year_order[lo:hi]] = True
+        return mask
+
+    def mask_epoch(self, epoch_name):
+        """Masque des éléments d'une époque"""
+        matches = np.flatnonzero(self.epoch_names == epoch_name)
+        if not len(matches):
+            return np.zeros(len(self), dtype=bool)
+        return self.epoch_codes == matches[0]
+
+    def sort_by_year(self, mask=None):
+        """Indices des éléments sélectionnés, triés par date de découverte"""
+        indices = np.flatnonzero(self._select(mask))
+        return indices[np.argsort(self.years[indices], kind='stable')]
+
+    def cumulative_counts(self, bucket_ends, mask=None):
+        """Nombre d'éléments sélectionnés découverts jusqu'à chaque année (incluse), par dichotomie"""
+        years = self.sorted_years if mask is None else self.years[self.sort_by_year(mask)]
+        return np.searchsorted(years, bucket_ends, side='right')
+
+    def indices_by_epoch(self, mask=None):
+        """Indices des éléments sélectionnés pour chaque époque, dans l'ordre du catalogue"""
+        indices = np.flatnonzero(self._select(mask))
+        indices = indices[np.argsort(self.epoch_codes[indices], kind='stable')]
+        bounds = np.searchsorted(self.epoch_codes[indices], np.arange(len(self.epoch_names) + 1))
+        return [indices[bounds[code]:bounds[code + 1]] for code in range(len(self.epoch_names))]
+
+    def count_by_epoch(self, mask=None):
+        """Nombre d'éléments sélectionnés par époque"""
+        return np.bincount(self.epoch_codes[self._select(mask)], minlength=len(self.epoch_names))
+
+    def mean_rgb_by_epoch(self, mask=None):
+        """Couleur moyenne (tronquée) et effectif des éléments sélectionnés, par époque"""
+        mask = self._select(mask)
+        codes = self.epoch_codes[mask]
+        counts = np.bincount(codes, minlength=len(self.epoch_names))
+        sums = np.zeros((len(self.epoch_names), 3), dtype=np.int64)
+        np.add.at(sums, codes, self.rgb[mask])
+        means = np.zeros_like(sums)
+        np.floor_divide(sums, counts[:, None], out=means, where=counts[:, None] > 0)
+        return means.astype(np.uint8), counts
+
+
+class ElementCatalog:
+    """Catalogue immuable: éléments, époques et spectres, construit une seule fois"""
+
+    __slots__ = ('elements_data', 'epochs_data', 'spectral_data', 'lines', 'spectra', 'colors',
+                 'index', 'columns', 'search', 'version')
+
+    def __init__(self, elements_data, epochs_data, spectral_data, lines=None):
+        # Enregistrements compacts et immuables (records.py), à partir de dicts ou d'enregistrements
+        object.__setattr__(self, 'elements_data', tuple(map(Element.from_mapping, elements_data)))
+        object.__setattr__(self, 'epochs_data', tuple(map(Epoch.from_mapping, epochs_data)))
+        object.__setattr__(self, 'spectral_data', MappingProxyType(
+            {_intern(symb): SpectralInfo.from_mapping(info) for symb, info in spectral_data.items()}))
+        # Base de raies complète fournie par la source, sinon déduite des données spectrales
+        object.__setattr__(self, 'lines', lines if lines is not None
+                           else LineDatabase.from_spectral_data(self.spectral_data))
+        object.__setattr__(self, 'spectra', SpectralEngine(self.spectral_data))
+        object.__setattr__(self, 'colors', default_color_engine())
+        # Couleurs de tous les spectres calculées en une seule opération matricielle
+        spectral_rgb = self.colors.element_colors(self.spectra, self.spectral_data)
+        object.__setattr__(self, 'index', CatalogIndex(self.elements_data, spectral_rgb))
+        object.__setattr__(self, 'columns', ElementColumns(
+            self.elements_data, self.epochs_data, self.spectral_data, self.index))
+        object.__setattr__(self, 'search', SearchIndex(self.elements_data, self.spectral_data))
+        object.__setattr__(self, 'version', self._compute_version())
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ElementCatalog est immuable ('{name}')")
+
+    def _compute_version(self):
+        """Empreinte du contenu, utilisée comme clé de cache par les vues"""
+        payload = json.dumps(
+            [_plain(self.elements_data), _plain(self.epochs_data),
+             {symb: info.plain() for symb, info in self.spectral_data.items()}],
+            sort_keys=True, ensure_ascii=False
+        )
+        digest = hashlib.sha1(payload.encode('utf-8'))
+        digest.update(self.lines.fingerprint().encode())
+        return digest.hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.elements_data)
+
+    def __repr__(self):
+        return f"ElementCatalog({len(self)} éléments, version={self.version})"
+
+
+def build_catalog():
+    """Construit le catalogue à partir des définitions intégrées"""
+    return ElementCatalog(
+        define_elements_with_discovery_dates(),
+        define_historical_epochs(),
+        define_spectral_rgb_data()
+    )
@@ -0,0 +1,230 @@
+"""Export statique du dashboard en pages HTML, sans serveur Streamlit
+
+Usage:
+    python export_static.py SORTIE [--data-dir DIR] [--workers N] [--force]
+
+Chaque vue en lecture seule (frise, époques, palette) et la page de chaque
+élément de l'explorateur sont rendues avec les vues du dashboard (views.py),
+sans Streamlit; les figures Plotly sont embarquées avec leur rendu HTML
+(figures.py), plotly.js est chargé depuis le CDN.
+Les pages sont réparties entre plusieurs processus. Le fichier manifest.json
+de la sortie conserve l'empreinte des données de chaque page: seules les
+pages dont les données (ou le code de rendu) ont changé sont réécrites.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from figures import CachedFigure, plotly_script
+from loaders import open_source, load_catalog_from
+from views import DashboardViews, PAGE_CSS, HEADER_HTML, FOOTER_HTML
+
+MANIFEST = 'manifest.json'
+
+# Pages rendues par tâche envoyée à un processus
+BATCH_SIZE = 32
+
+# Vues en lecture seule: page → titre
+VIEWS = {
+    'index.html': "Accueil",
+    'frise.html': "Frise Chronologique",
+    'epoques.html': "Vue par Époque",
+    'palette.html': "Analyse Spectrale",
+}
+
+_dashboard = None
+
+
+def render_version():
+    """Empreinte du code de rendu: une modification de l'un des modules du dépôt chargés
+    par l'export (vues, catalogue, spectres, enregistrements, figures...) invalide toutes les pages"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted({os.path.abspath(module.__file__) for module in list(sys.modules.values())
+                    if str(getattr(module, '__file__', None)).endswith('.py')
+                    and os.path.dirname(os.path.abspath(module.__file__)) == here})
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(os.path.basename(path).encode('utf-8'))
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def element_path(symb):
+    return f'elements/{symb}.html'
+
+
+def page_inputs(catalog, version):
+    """Empreinte des données de chaque page: la version du catalogue pour les vues,
+    les seules données de l'élément pour sa page"""
+    keys = {path: f'{version}-{catalog.version}' for path in VIEWS}
+    for element in catalog.elements_data:
+        symb = element['symbole']
+        spectral_info = catalog.spectral_data.get(symb)
+        inputs = {
+            'element': element.plain(),
+            'spectre': spectral_info.plain() if spectral_info is not None else None,
+            'rgb': catalog.index.element_rgb(symb),
+        }
+        payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=list)
+        keys[element_path(symb)] = f'{version}-{hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]}'
+    return keys
+
+
+def _init_worker(data_dir):
+    """Catalogue et vues chargés une fois par processus"""
+    global _dashboard
+    _dashboard = DashboardViews(load_catalog_from(open_source(data_dir)))
+
+
+def page_html(title, body, depth=0):
+    root = '../' * depth
+    nav = ' · '.join(f'<a href="{root}{path}">{name}</a>' for path, name in VIEWS.items())
+    return (
+        f'<!DOCTYPE html>\n<html lang="fr">\n<head>\n<meta charset="utf-8">\n'
+        f'<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{title}</title>\n'
+        f'{plotly_script()}\n'
+        f'{PAGE_CSS}\n</head>\n<body style="font-family: sans-serif; max-width: 1400px; margin: auto;">\n'
+        f'<nav style="text-align: center; margin: 1rem 0;">{nav}</nav>\n'
+        f'{body}\n<hr>\n{FOOTER_HTML}\n</body>\n</html>\n'
+    )
+
+
+def render_index(dashboard):
+    blocks = []
+    for epoch, indices in zip(dashboard.epochs_data, dashboard.columns.indices_by_epoch()):
+        links = ''.join(
+            f'<a class="discovery-card" style="display: block; text-decoration: none;" '
+            f'href="{element_path(dashboard.elements_data[i]["symbole"])}">'
+            f'<strong>{dashboard.elements_data[i]["symbole"]}</strong> {dashboard.elements_data[i]["nom"]}</a>'
+            for i in indices)
+        blocks.append(f'<h3 class="section-header">{epoch["nom"]} ({epoch["periode"]})</h3>'
+                      f'<div class="discovery-grid">{links}</div>')
+    return page_html("Tableau Périodique par Date de Découverte", HEADER_HTML + ''.join(blocks))
+
+
+def epoch_overview_html(dashboard):
+    blocks = ''.join(
+        dashboard.epoch_block_html(epoch, [dashboard.elements_data[i] for i in indices])
+        for epoch, indices in zip(dashboard.epochs_data, dashboard.columns.indices_by_epoch()))
+    return '<h3 class="section-header">🏺 CLASSIFICATION PAR ÉPOQUE HISTORIQUE</h3>' + blocks
+
+
+def render_timeline(dashboard):
+    body = ('<h3 class="section-header">📅 FRISE CHRONOLOGIQUE DES DÉCOUVERTES</h3>'
+            + CachedFigure(dashboard.timeline_figure()).html + epoch_overview_html(dashboard))
+    return page_html("Frise Chronologique", body)
+
+
+def render_epochs(dashboard):
+    return page_html("Vue par Époque", epoch_overview_html(dashboard))
+
+
+def render_palette(dashboard):
+    epoch_stats = dashboard.epoch_stats(None)
+    body = (
+        '<h3 class="section-header">🌈 ANALYSE DES SPECTRES RGB PAR PÉRIODE</h3>'
+        '<div style="display: grid; grid-template-columns: 2fr 1fr; gap: 1rem;">'
+        f'<div><h3>Palette des Époques</h3>{"".join(map(dashboard.palette_entry_html, epoch_stats))}</div>'
+        f'<div><h3>Évolution des Couleurs</h3>{CachedFigure(dashboard.palette_figure(None)).html}</div>'
+        '</div>'
+    )
+    return page_html("Analyse Spectrale", body + epoch_overview_html(dashboard))
+
+
+def render_element(dashboard, symb):
+    history_html, spectrum_html, simulated_html = dashboard.element_cards_html(symb)
+    body = (
+        '<h3 class="section-header">🔍 EXPLORATEUR DES SPECTRES RGB</h3>'
+        + dashboard.element_banner_html(symb)
+        + '<div style="display: grid; grid-template-columns: repeat(3, minmax(0, 1fr)); gap: 1rem;">'
+        f'<div>{history_html}</div><div>{spectrum_html}</div>'
+        f'<div>{simulated_html}{CachedFigure(dashboard.spectrum_figure(symb)).html}</div>'
+        '</div>'
+    )
+    element = dashboard.index.by_symbol[symb]
+    return page_html(f"{symb} - {element['nom']}", body, depth=1)
+
+
+VIEW_RENDERERS = {
+    'index.html': render_index,
+    'frise.html': render_timeline,
+    'epoques.html': render_epochs,
+    'palette.html': render_palette,
+}
+
+
+def render_pages(output_dir, paths):
+    """Rend et écrit un lot de pages dans le processus courant"""
+    for path in paths:
+        if path in VIEW_RENDERERS:
+            html = VIEW_RENDERERS[path](_dashboard)
+        else:
+            html = render_element(_dashboard, path[len('elements/'):-len('.html')])
+        target = os.path.join(output_dir, path)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp = target + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp, target)
+    return paths
+
+
+def export(output_dir, data_dir=None, workers=None, force=False):
+    """Rend les pages dont les données ont changé; renvoie (rendues, inchangées, supprimées)"""
+    catalog = load_catalog_from(open_source(data_dir))
+    keys = page_inputs(catalog, render_version())
+
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    previous = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    stale = [path for path, key in keys.items()
+             if previous.get(path) != key or not os.path.exists(os.path.join(output_dir, path))]
+
+    os.makedirs(output_dir, exist_ok=True)
+    batches = [stale[i:i + BATCH_SIZE] for i in range(0, len(stale), BATCH_SIZE)]
+    if workers == 1 or len(batches) <= 1:
+        _init_worker(data_dir)
+        for batch in batches:
+            render_pages(output_dir, batch)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            for _ in pool.map(render_pages, [output_dir] * len(batches), batches):
+                pass
+
+    # Pages d'éléments retirés du catalogue
+    removed = [path for path in previous if path not in keys]
+    for path in removed:
+        target = os.path.join(output_dir, path)
+        if os.path.exists(target):
+            os.remove(target)
+
+    tmp = manifest_path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(keys, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path)
+    return len(stale), len(keys) - len(stale), len(removed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('output', help="répertoire de sortie")
+    parser.add_argument('--data-dir', default=os.environ.get('DASHBOARD_DATA_DIR'),
+                        help="répertoire de données CSV/JSON (définitions intégrées par défaut)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="nombre de processus (par défaut: nombre de cœurs)")
+    parser.add_argument('--force', action='store_true', help="tout rendre, sans tenir compte du manifeste")
+    args = parser.parse_args()
+
+    rendered, unchanged, removed = export(args.output, args.data_dir, args.workers, args.force)
+    print(f"{rendered} pages rendues, {unchanged} inchangées, {removed} supprimées")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Caches des figures Plotly et des fragments de vues, partagés par toutes les sessions du processus
+
+Chaque entrée est indexée par (vue, entrées déclarées de la vue, version des
+données). La construction des figures Plotly est la part dominante du coût
+d'un rerun; elle n'a lieu qu'au premier affichage, puis l'application affiche
+la figure en cache avec st.plotly_chart. L'export statique embarque dans ses
+pages le rendu HTML des figures (CachedFigure), sans plotly.js. Les fragments
+(blocs HTML, statistiques, options des widgets) ne sont de même recalculés
+que si l'une des entrées de leur vue a changé.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+pio = lazy_import('plotly.io')
+plotly_offline = lazy_import('plotly.offline')
+
+PLOTLY_CONFIG = {'responsive': True}
+
+# Hauteur des figures sans hauteur déclarée (valeur par défaut de Plotly), en pixels
+DEFAULT_FIGURE_HEIGHT = 450
+
+
+def plotly_script():
+    """Balise de chargement de plotly.js (CDN) pour les pages de l'export statique, dans la version de la bibliothèque Python"""
+    return f'<script src="https://cdn.plot.ly/plotly-{plotly_offline.get_plotlyjs_version()}.min.js"></script>'
+
+
+def figure_html(figure):
+    """Figure Plotly sous forme de <div>, avec sa spécification JSON embarquée (plotly.js non inclus)"""
+    return pio.to_html(figure, full_html=False, include_plotlyjs=False, config=PLOTLY_CONFIG,
+                       auto_play=False, validate=False)
+
+
+class CachedFigure:
+    """Rendu HTML d'une figure et sa hauteur en pixels, tels qu'embarqués par l'export statique"""
+
+    __slots__ = ('html', 'height')
+
+    def __init__(self, figure):
+        self.html = figure_html(figure)
+        self.height = figure.layout.height or DEFAULT_FIGURE_HEIGHT
+
+    @property
+    def nbytes(self):
+        return len(self.html.encode('utf-8'))
+
+
+class RenderCache:
+    """Cache LRU de contenus de vues, protégé par un verrou pour les sessions concurrentes"""
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Contenu en cache pour la clé, construit par build() si absent"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Construction hors verrou; deux sessions simultanées peuvent construire le même contenu
+        entry = build()
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+FIGURE_CACHE = RenderCache()
+FRAGMENT_CACHE = RenderCache(max_entries=1024)
+
+
+def bin_events(x, groups, n_groups, edges):
+    """Nombre d'événements par groupe et par colonne [edges[i], edges[i + 1]] (groupes × colonnes)"""
+    n_columns = len(edges) - 1
+    column = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, n_columns - 1)
+    inside = (x >= edges[0]) & (x <= edges[-1])
+    flat = groups[inside].astype(np.int64) * n_columns + column[inside]
+    return np.bincount(flat, minlength=n_groups * n_columns).reshape(n_groups, n_columns)
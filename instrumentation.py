@@ -0,0 +1,194 @@
+"""Instrumentation optionnelle des méthodes du dashboard
+
+Activée par la variable d'environnement DASHBOARD_PROFILE:
+    DASHBOARD_PROFILE=1        durée et nombre d'appels de chaque méthode, par rerun
+    DASHBOARD_PROFILE=memory   idem, plus la variation de mémoire allouée (tracemalloc)
+
+Sans cette variable, instrument() laisse la classe intacte et rerun() ne fait
+rien: aucun coût en production. Les mesures de chaque rerun alimentent deux
+fenêtres glissantes, l'une propre à la session, l'autre au processus. Les
+durées sont inclusives (une vue compte le temps des figures qu'elle construit).
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+# Niveau d'instrumentation: '' (désactivée), '1' ou 'memory'
+PROFILE_MODE = os.environ.get('DASHBOARD_PROFILE', '').strip().lower()
+
+# Nombre de reruns conservés par fenêtre glissante
+ROLLING_WINDOW = int(os.environ.get('DASHBOARD_PROFILE_WINDOW', 200))
+
+PERCENTILES = (50, 90, 99)
+
+
+class Profiler:
+    """Mesures par méthode et par rerun, agrégées par session et par processus"""
+
+    def __init__(self, enabled=False, memory=False, window=ROLLING_WINDOW):
+        self.enabled = enabled
+        self.memory = memory
+        self.window = window
+        self.reruns = 0
+        # Méthode → échantillons (ms, appels, octets alloués) des derniers reruns du processus
+        self.process = {}
+        # Méthode → (reruns, secondes, appels) cumulés depuis le démarrage, pour les compteurs Prometheus
+        self.totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def wrap(self, name, func):
+        """Méthode chronométrée; les mesures vont au rerun en cours du thread appelant"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            current = getattr(self._local, 'current', None)
+            if current is None:
+                return func(*args, **kwargs)
+            allocated = tracemalloc.get_traced_memory()[0] if self.memory else 0
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sample = current.setdefault(name, [0.0, 0, 0])
+                sample[0] += (time.perf_counter() - start) * 1000
+                sample[1] += 1
+                if self.memory:
+                    sample[2] += tracemalloc.get_traced_memory()[0] - allocated
+        return wrapper
+
+    def instrument(self, cls, predicate):
+        """Remplace les méthodes de cls dont le nom satisfait predicate; sans effet si désactivé
+
+        Les fragments déjà chronométrés par fragment() sont laissés tels quels.
+        """
+        if not self.enabled:
+            return cls
+        for name, func in list(vars(cls).items()):
+            if (callable(func) and not name.startswith('_') and predicate(name)
+                    and not getattr(func, '_profiled', False)):
+                setattr(cls, name, self.wrap(name, func))
+        return cls
+
+    def fragment(self, decorator, session):
+        """Décorateur de fragment (comme st.fragment) dont les reruns partiels sont mesurés
+
+        Un rerun partiel n'exécute que la fonction du fragment, hors du rerun
+        ouvert par le script: la fonction est chronométrée à l'intérieur du
+        fragment, dans un rerun de la session (session() → dict) ouvert s'il n'y
+        en a pas déjà un.
+        """
+        def apply(func):
+            if not self.enabled:
+                return decorator(func)
+            timed = self.wrap(func.__name__, func)
+
+            @functools.wraps(func)
+            def scoped(*args, **kwargs):
+                with self.rerun(session()):
+                    return timed(*args, **kwargs)
+            scoped._profiled = True
+            return decorator(scoped)
+        return apply
+
+    @contextlib.contextmanager
+    def rerun(self, session):
+        """Délimite un rerun; ses mesures rejoignent la fenêtre de la session (dict) et du processus
+
+        Imbriqué dans un rerun en cours (fragment exécuté par le script), il n'en ouvre pas d'autre.
+        """
+        if not self.enabled or getattr(self._local, 'current', None) is not None:
+            yield
+            return
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._local.current = {}
+        try:
+            yield
+        finally:
+            current, self._local.current = self._local.current, None
+            self._record(session, current)
+
+    def _record(self, session, current):
+        with self._lock:
+            self.reruns += 1
+            for name, (ms, calls, allocated) in current.items():
+                sample = (ms, calls, allocated)
+                self.process.setdefault(name, deque(maxlen=self.window)).append(sample)
+                totals = self.totals.setdefault(name, [0, 0.0, 0])
+                totals[0] += 1
+                totals[1] += ms / 1000
+                totals[2] += calls
+        for name, sample in current.items():
+            session.setdefault(name, deque(maxlen=self.window)).append(tuple(sample))
+
+    def summary(self, samples=None):
+        """Percentiles de durée par rerun, appels et allocations moyens, par méthode (plus lente d'abord)"""
+        if samples is None:
+            with self._lock:
+                samples = {name: list(values) for name, values in self.process.items()}
+        rows = []
+        for name, values in samples.items():
+            values = np.array(list(values), dtype=float).reshape(-1, 3)
+            percentiles = np.percentile(values[:, 0], PERCENTILES)
+            row = {'methode': name, 'reruns': len(values)}
+            row.update({f'p{p}_ms': round(float(v), 3) for p, v in zip(PERCENTILES, percentiles)})
+            row['appels_par_rerun'] = round(float(values[:, 1].mean()), 2)
+            if self.memory:
+                row['alloc_kio'] = round(float(values[:, 2].mean()) / 1024, 1)
+            rows.append(row)
+        return sorted(rows, key=lambda row: -row[f'p{PERCENTILES[-1]}_ms'])
+
+    def to_json(self, session=None):
+        """Export JSON des fenêtres du processus et, si fournie, de la session"""
+        report = {'mode': PROFILE_MODE, 'fenetre': self.window, 'reruns': self.reruns,
+                  'processus': self.summary()}
+        if session is not None:
+            report['session'] = self.summary(session)
+        return json.dumps(report, ensure_ascii=False, indent=2)
+
+    def to_prometheus(self):
+        """Export au format texte Prometheus (fenêtre du processus et compteurs cumulés)
+
+        Chaque famille de métriques forme un bloc contigu précédé de # HELP et # TYPE.
+        """
+        rows = self.summary()
+        with self._lock:
+            totals = {name: tuple(values) for name, values in self.totals.items()}
+        labels = [(f'method="{row["methode"]}"', row, totals.get(row['methode'], (0, 0.0, 0))) for row in rows]
+
+        out = [
+            '# HELP dashboard_method_seconds Durée par rerun des méthodes du dashboard (fenêtre glissante)',
+            '# TYPE dashboard_method_seconds summary',
+        ]
+        for label, row, (observations, seconds, _) in labels:
+            for p in PERCENTILES:
+                out.append(f'dashboard_method_seconds{{{label},quantile="{p / 100:g}"}} {row[f"p{p}_ms"] / 1000:.6f}')
+            out.append(f'dashboard_method_seconds_sum{{{label}}} {seconds:.6f}')
+            out.append(f'dashboard_method_seconds_count{{{label}}} {observations}')
+
+        out.append('# HELP dashboard_method_calls_total Appels des méthodes du dashboard depuis le démarrage')
+        out.append('# TYPE dashboard_method_calls_total counter')
+        for label, _, (_, _, calls) in labels:
+            out.append(f'dashboard_method_calls_total{{{label}}} {calls}')
+
+        if self.memory:
+            out.append('# HELP dashboard_method_alloc_bytes Mémoire allouée par rerun, moyenne de la fenêtre glissante')
+            out.append('# TYPE dashboard_method_alloc_bytes gauge')
+            for label, row, _ in labels:
+                out.append(f'dashboard_method_alloc_bytes{{{label}}} {row["alloc_kio"] * 1024:.0f}')
+
+        out.append('# HELP dashboard_reruns_total Reruns instrumentés depuis le démarrage')
+        out.append('# TYPE dashboard_reruns_total counter')
+        out.append(f'dashboard_reruns_total {self.reruns}')
+        return '\n'.join(out) + '\n'
+
+
+PROFILER = Profiler(enabled=bool(PROFILE_MODE) and PROFILE_MODE not in ('0', 'off'),
+                    memory=PROFILE_MODE == 'memory')
@@ -0,0 +1,86 @@
+"""Imports différés et mesure du coût d'import au démarrage
+
+Les modules lourds ne sont chargés qu'au premier accès à l'un de leurs
+attributs, c'est-à-dire quand une vue en a réellement besoin. Chaque import
+est chronométré une seule fois par processus et exposé par import_report().
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+import types
+
+# Budget de démarrage à froid, en millisecondes
+IMPORT_BUDGET_MS = float(os.environ.get('DASHBOARD_IMPORT_BUDGET_MS', 2000))
+
+# Mode de démarrage: 'lazy' (par défaut) ou 'eager' pour tout précharger
+IMPORT_MODE = os.environ.get('DASHBOARD_IMPORT_MODE', 'lazy')
+
+_records = {}
+_lazy_modules = set()
+_lock = threading.Lock()
+
+
+def _import(name, trigger):
+    """Importe un module et enregistre sa durée s'il n'était pas déjà chargé"""
+    if name in sys.modules:
+        _records.setdefault(name, {'module': name, 'ms': 0.0, 'trigger': 'déjà chargé'})
+        return sys.modules[name]
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(name)
+        _records[name] = {
+            'module': name,
+            'ms': (time.perf_counter() - start) * 1000,
+            'trigger': trigger,
+        }
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module chargé au premier accès à l'un de ses attributs"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = _import(self.__name__, 'à la demande')
+            self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """Retourne un module différé, ou le module lui-même en mode 'eager'"""
+    _lazy_modules.add(name)
+    if IMPORT_MODE == 'eager':
+        return _import(name, 'démarrage')
+    return LazyModule(name)
+
+
+def timed_imports(*names):
+    """Importe immédiatement des modules en mesurant leur coût de démarrage"""
+    return [_import(name, 'démarrage') for name in names]
+
+
+def import_report():
+    """Coût des imports du processus, du plus lent au plus rapide"""
+    rows = [dict(row) for row in _records.values()]
+    for name in _lazy_modules - _records.keys():
+        # Un module différé peut avoir été importé par une autre bibliothèque (plotly par streamlit)
+        trigger = 'chargé par une dépendance' if name in sys.modules else 'non chargé'
+        rows.append({'module': name, 'ms': 0.0, 'trigger': trigger})
+    return sorted(rows, key=lambda row: row['ms'], reverse=True)
+
+
+def total_import_ms():
+    return sum(row['ms'] for row in _records.values())
@@ -0,0 +1,155 @@
+"""Base de raies d'émission triée par longueur d'onde, projetable en mémoire
+
+Chaque raie est un enregistrement (longueur d'onde, intensité relative,
+identifiant d'élément). Les enregistrements sont triés par longueur d'onde;
+une permutation triée par élément donne les raies de chaque élément. Toutes
+les requêtes sont des recherches dichotomiques sur ces tableaux, sans créer
+d'objet Python par raie.
+"""
+import hashlib
+import os
+
+import numpy as np
+
+from spectral import parse_lines
+
+LINE_DTYPE = np.dtype([('wavelength', '<f4'), ('intensity', '<f4'), ('element', '<i4')])
+
+_FILES = ('lines.npy', 'line_symbols.npy', 'lines_by_element.npy', 'line_offsets.npy')
+
+
+class LineDatabase:
+    """Raies d'émission de tous les éléments, avec requêtes par fenêtre et par élément"""
+
+    def __init__(self, records, symbols, by_element, offsets):
+        self.records = records          # triés par longueur d'onde
+        self.symbols = symbols          # identifiant d'élément → symbole
+        self.by_element = by_element    # indices des raies triés par (élément, longueur d'onde)
+        self.offsets = offsets          # raies de l'élément i: by_element[offsets[i]:offsets[i + 1]]
+        self.element_ids = {symb: i for i, symb in enumerate(symbols.tolist())}
+
+    @classmethod
+    def from_arrays(cls, line_symbols, wavelengths, intensities):
+        """Construit la base à partir de colonnes non triées"""
+        symbols, element_ids = np.unique(np.asarray(line_symbols, dtype=str), return_inverse=True)
+        records = np.empty(len(element_ids), dtype=LINE_DTYPE)
+        records['wavelength'] = wavelengths
+        records['intensity'] = intensities
+        records['element'] = element_ids
+        records = records[np.argsort(records['wavelength'], kind='stable')]
+        by_element = np.lexsort((records['wavelength'], records['element'])).astype(np.int32)
+        offsets = np.searchsorted(records['element'][by_element], np.arange(len(symbols) + 1))
+        return cls(records, symbols, by_element, offsets.astype(np.int64))
+
+    @classmethod
+    def from_spectral_data(cls, spectral_data):
+        """Base réduite aux raies listées dans les données spectrales du catalogue"""
+        line_symbols, wavelengths, intensities = [], [], []
+        for symb, spectral_info in spectral_data.items():
+            positions, amplitudes = parse_lines(spectral_info)
+            line_symbols += [symb] * len(positions)
+            wavelengths += positions
+            intensities += amplitudes
+        return cls.from_arrays(line_symbols, np.array(wavelengths, dtype=np.float32),
+                               np.array(intensities, dtype=np.float32))
+
+    def save(self, directory):
+        for name, array in zip(_FILES, (self.records, self.symbols, self.by_element, self.offsets)):
+            np.save(os.path.join(directory, name), array)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Ouvre une base enregistrée par save(), projetée en mémoire par défaut"""
+        return cls(*(np.load(os.path.join(directory, name), mmap_mode=mmap_mode) for name in _FILES))
+
+    def __len__(self):
+        return len(self.records)
+
+    def fingerprint(self):
+        digest = hashlib.sha1(np.ascontiguousarray(self.records).tobytes())
+        digest.update('\0'.join(self.symbols.tolist()).encode('utf-8'))
+        return digest.hexdigest()[:12]
+
+    def _bounds(self, start, end):
+        wavelengths = self.records['wavelength']
+        return (np.searchsorted(wavelengths, start, side='left'),
+                np.searchsorted(wavelengths, end, side='right'))
+
+    def window(self, start, end):
+        """Raies dont la longueur d'onde est comprise dans [start, end] (vue, sans copie)"""
+        lo, hi = self._bounds(start, end)
+        return self.records[lo:hi]
+
+    def count(self, start, end):
+        lo, hi = self._bounds(start, end)
+        return int(hi - lo)
+
+    def elements_in_window(self, start, end):
+        """Éléments émettant dans [start, end], classés par intensité de leur raie la plus forte"""
+        lines = self.window(start, end)
+        if not len(lines):
+            return []
+        strongest = np.zeros(len(self.symbols), dtype=np.float32)
+        np.maximum.at(strongest, lines['element'], lines['intensity'])
+        present = np.flatnonzero(np.bincount(lines['element'], minlength=len(self.symbols)))
+        ranked = present[np.argsort(-strongest[present], kind='stable')]
+        return [(str(self.symbols[i]), float(strongest[i])) for i in ranked]
+
+    def element_lines(self, symbol):
+        """Raies d'un élément, triées par longueur d'onde"""
+        element_id = self.element_ids.get(symbol)
+        if element_id is None:
+            return self.records[:0]
+        lo, hi = self.offsets[element_id], self.offsets[element_id + 1]
+        return self.records[self.by_element[lo:hi]]
+
+    def binned_intensity(self, start, end, bins):
+        """Intensité cumulée des raies par intervalle de longueur d'onde, pour le tracé"""
+        lines = self.window(start, end)
+        edges = np.linspace(start, end, bins + 1)
+        totals, _ = np.histogram(lines['wavelength'], bins=edges, weights=lines['intensity'])
+        return (edges[:-1] + edges[1:]) / 2, totals
+
+    def match_peaks(self, peak_wavelengths, peak_intensities, tolerance, observed_range=None):
+        """Classe les éléments selon la part de leurs raies retrouvées parmi des pics mesurés
+
+        Chaque pic est rapproché des raies situées à moins de `tolerance` nm par
+        recherche dichotomique. Le score d'un élément est l'intensité de ses raies
+        retrouvées (pondérée par la proximité et l'intensité du pic), rapportée à
+        l'intensité de toutes ses raies dans le domaine observé.
+        """
+        wavelengths = self.records['wavelength']
+        lo = np.searchsorted(wavelengths, peak_wavelengths - tolerance, side='left')
+        hi = np.searchsorted(wavelengths, peak_wavelengths + tolerance, side='right')
+        counts = hi - lo
+        if not counts.sum():
+            return []
+
+        # Paires (pic, raie) candidates, sans boucle Python
+        peak_of_pair = np.repeat(np.arange(len(counts)), counts)
+        line_of_pair = np.repeat(lo, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        lines = self.records[line_of_pair]
+        closeness = 1 - np.abs(lines['wavelength'] - peak_wavelengths[peak_of_pair]) / tolerance
+        weight = lines['intensity'] * closeness * np.sqrt(peak_intensities[peak_of_pair])
+
+        # Une raie n'est comptée qu'une fois, avec son meilleur pic
+        best = np.zeros(len(self.records), dtype=np.float64)
+        np.maximum.at(best, line_of_pair, weight)
+        matched_lines = np.unique(line_of_pair)
+        element_ids = self.records['element'][matched_lines]
+        matched = np.bincount(element_ids, weights=best[matched_lines], minlength=len(self.symbols))
+        matched_count = np.bincount(element_ids, minlength=len(self.symbols))
+
+        start, end = observed_range if observed_range is not None else (wavelengths[0], wavelengths[-1])
+        visible = self.window(start, end)
+        expected = np.bincount(visible['element'], weights=visible['intensity'], minlength=len(self.symbols))
+        expected_count = np.bincount(visible['element'], minlength=len(self.symbols))
+
+        candidates = np.flatnonzero((matched > 0) & (expected > 0))
+        scores = matched[candidates] / expected[candidates]
+        order = np.lexsort((-matched_count[candidates], -scores))
+        return [
+            {'symbole': str(self.symbols[i]), 'score': float(scores[k]),
+             'raies_trouvees': int(matched_count[i]), 'raies_attendues': int(expected_count[i])}
+            for k, i in ((k, candidates[k]) for k in order)
+        ]
@@ -0,0 +1,286 @@
+"""Sources de données du catalogue: définitions intégrées ou fichiers CSV/JSON
+
+Un répertoire de données contient:
+    elements.csv|json   symbole, nom, date_decouverte, decouvreur, periode_epoch
+    epochs.csv|json     nom, periode, couleur, description, elements (séparés par ';' en CSV)
+    lines.csv|json      symbole, longueur_onde, intensite (optionnel)
+
+Les fichiers sont validés puis compilés dans un cache binaire de fichiers .npy,
+rangé dans un sous-répertoire nommé d'après l'empreinte des sources. Les
+démarrages suivants projettent ce cache en mémoire au lieu de relire les sources;
+la base de raies complète (line_database.LineDatabase) n'est jamais chargée
+en objets Python.
+"""
+import csv
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+import catalog
+from line_database import LineDatabase
+from catalog import ElementCatalog
+
+# À incrémenter quand le format du cache change
+CACHE_FORMAT = 2
+
+# Nombre de raies les plus intenses conservées par élément dans le catalogue
+MAX_RAIES = 8
+
+ELEMENT_FIELDS = ('symbole', 'nom', 'date_decouverte', 'decouvreur', 'periode_epoch')
+EPOCH_FIELDS = ('nom', 'periode', 'couleur', 'description', 'elements')
+LINE_FIELDS = ('symbole', 'longueur_onde')
+
+
+class DatasetError(ValueError):
+    """Fichier de données absent, illisible ou invalide"""
+
+
+def _read_rows(path):
+    """Lignes d'un fichier CSV ou JSON, sous forme de dicts"""
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            rows = json.load(f)
+        if not isinstance(rows, list):
+            raise DatasetError(f"{path}: une liste d'objets est attendue")
+        return rows
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def _find(data_dir, stem, required=True):
+    for ext in ('.csv', '.json'):
+        path = os.path.join(data_dir, stem + ext)
+        if os.path.exists(path):
+            return path
+    if required:
+        raise DatasetError(f"{data_dir}: {stem}.csv ou {stem}.json introuvable")
+    return None
+
+
+def _require(row, fields, path, line):
+    missing = [field for field in fields if row.get(field) in (None, '')]
+    if missing:
+        raise DatasetError(f"{path}:{line}: champ(s) manquant(s) {', '.join(missing)}")
+
+
+def validate_epochs(rows, path):
+    epochs = []
+    for line, row in enumerate(rows, start=1):
+        _require(row, EPOCH_FIELDS, path, line)
+        members = row['elements']
+        if isinstance(members, str):
+            members = [m.strip() for m in members.split(';') if m.strip()]
+        epochs.append({
+            'nom': row['nom'], 'periode': row['periode'], 'couleur': row['couleur'],
+            'description': row['description'], 'elements': list(members)
+        })
+    return epochs
+
+
+def validate_elements(rows, path, epoch_names):
+    elements, seen = [], set()
+    for line, row in enumerate(rows, start=1):
+        _require(row, ELEMENT_FIELDS, path, line)
+        if row['symbole'] in seen:
+            raise DatasetError(f"{path}:{line}: symbole {row['symbole']!r} en double")
+        if row['periode_epoch'] not in epoch_names:
+            raise DatasetError(f"{path}:{line}: époque inconnue {row['periode_epoch']!r}")
+        try:
+            year = int(row['date_decouverte'])
+        except (TypeError, ValueError):
+            raise DatasetError(f"{path}:{line}: date_decouverte non entière {row['date_decouverte']!r}")
+        seen.add(row['symbole'])
+        elements.append({
+            'symbole': row['symbole'], 'nom': row['nom'], 'date_decouverte': year,
+            'decouvreur': row['decouvreur'], 'periode_epoch': row['periode_epoch']
+        })
+    return elements
+
+
+def validate_lines(rows, path):
+    """Raies sous forme de colonnes: symboles, longueurs d'onde (nm) et intensités relatives"""
+    symbols = []
+    wavelengths = np.empty(len(rows), dtype=np.float32)
+    intensities = np.empty(len(rows), dtype=np.float32)
+    for line, row in enumerate(rows, start=1):
+        _require(row, LINE_FIELDS, path, line)
+        try:
+            wavelengths[line - 1] = float(row['longueur_onde'])
+            intensite = row.get('intensite')
+            intensities[line - 1] = 1.0 if intensite in (None, '') else float(intensite)
+        except (TypeError, ValueError):
+            raise DatasetError(f"{path}:{line}: longueur d'onde ou intensité non numérique")
+        if wavelengths[line - 1] <= 0 or intensities[line - 1] < 0:
+            raise DatasetError(f"{path}:{line}: longueur d'onde ou intensité hors limites")
+        symbols.append(row['symbole'])
+    return np.array(symbols, dtype=str), wavelengths, intensities
+
+
+def spectral_data_from_lines(symbols, wavelengths, intensities, max_raies=MAX_RAIES):
+    """Données spectrales du catalogue: raie principale et raies les plus intenses par élément"""
+    # Tri par symbole puis intensité décroissante, pour découper chaque élément d'un bloc
+    order = np.lexsort((-intensities, symbols))
+    symbols, wavelengths = symbols[order], wavelengths[order]
+    uniques, starts = np.unique(symbols, return_index=True)
+    bounds = list(starts) + [len(symbols)]
+    spectral_data = {}
+    for i, symb in enumerate(uniques.tolist()):
+        top = wavelengths[bounds[i]:min(bounds[i + 1], bounds[i] + max_raies)].tolist()
+        spectral_data[symb] = {
+            'longueur_onde_principale': round(top[0], 1),
+            'raies': [f'{w:.1f} nm' for w in top]
+        }
+    return spectral_data
+
+
+def _stat_signature(path):
+    """Signature peu coûteuse d'un fichier (date de modification, taille), sans le lire"""
+    if path is None or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+_CATALOG_SIGNATURE = _stat_signature(catalog.__file__)
+
+
+class BuiltinSource:
+    """Définitions intégrées au code (define_*)"""
+
+    name = 'builtin'
+
+    def signature(self):
+        return _stat_signature(catalog.__file__)
+
+    def fingerprint(self):
+        with open(catalog.__file__, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()[:16]
+
+    def definitions(self):
+        """Module des define_*: celui importé, ou catalog.py relu s'il a été modifié depuis"""
+        if self.signature() == _CATALOG_SIGNATURE:
+            return catalog
+        spec = importlib.util.spec_from_file_location('_catalog_definitions', catalog.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def read(self):
+        definitions = self.definitions()
+        return (definitions.define_elements_with_discovery_dates(), definitions.define_historical_epochs(),
+                definitions.define_spectral_rgb_data(), None)
+
+
+class FileSource:
+    """Répertoire de fichiers CSV/JSON, compilé dans un cache binaire projeté en mémoire"""
+
+    def __init__(self, data_dir, cache_dir=None):
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir or os.path.join(data_dir, '.cache')
+        self.name = f'fichiers:{data_dir}'
+
+    def paths(self):
+        return {
+            'elements': _find(self.data_dir, 'elements'),
+            'epochs': _find(self.data_dir, 'epochs'),
+            'lines': _find(self.data_dir, 'lines', required=False),
+        }
+
+    def signature(self):
+        """Dates et tailles des fichiers sources, pour détecter une modification sans les relire"""
+        return tuple(sorted((key, _stat_signature(path)) for key, path in self.paths().items()))
+
+    def fingerprint(self):
+        """Empreinte du contenu des fichiers sources et du format du cache"""
+        digest = hashlib.sha256(f'format-{CACHE_FORMAT}'.encode())
+        for key, path in sorted(self.paths().items()):
+            digest.update(key.encode())
+            if path is not None:
+                digest.update(os.path.basename(path).encode())
+                with open(path, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(block)
+        return digest.hexdigest()[:16]
+
+    def read(self):
+        cache_path = os.path.join(self.cache_dir, self.fingerprint())
+        if not os.path.isdir(cache_path):
+            self.compile(cache_path)
+        return self.load_cache(cache_path)
+
+    def parse(self):
+        """Lit et valide les fichiers sources"""
+        paths = self.paths()
+        epochs = validate_epochs(_read_rows(paths['epochs']), paths['epochs'])
+        elements = validate_elements(_read_rows(paths['elements']), paths['elements'],
+                                     {epoch['nom'] for epoch in epochs})
+        if paths['lines'] is None:
+            lines = (np.array([], dtype=str), np.array([], dtype=np.float32),
+                     np.array([], dtype=np.float32))
+        else:
+            lines = validate_lines(_read_rows(paths['lines']), paths['lines'])
+        return elements, epochs, lines
+
+    def compile(self, cache_path):
+        """Écrit le cache binaire; le renommage final le rend visible de façon atomique"""
+        elements, epochs, (line_symbols, wavelengths, intensities) = self.parse()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=self.cache_dir, prefix='.tmp-')
+        try:
+            for field in ELEMENT_FIELDS:
+                values = [e[field] for e in elements]
+                dtype = np.int32 if field == 'date_decouverte' else str
+                np.save(os.path.join(tmp_path, f'element_{field}.npy'), np.array(values, dtype=dtype))
+            # Raies triées par longueur d'onde, pour les recherches dichotomiques
+            LineDatabase.from_arrays(line_symbols, wavelengths, intensities).save(tmp_path)
+            with open(os.path.join(tmp_path, 'catalog.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'epochs': epochs,
+                    'spectral_data': spectral_data_from_lines(line_symbols, wavelengths, intensities)
+                }, f, ensure_ascii=False)
+            try:
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                # Un autre processus a compilé le même cache entre-temps
+                if not os.path.isdir(cache_path):
+                    raise
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        self.prune(keep=os.path.basename(cache_path))
+
+    def prune(self, keep):
+        """Supprime les caches des versions précédentes des sources"""
+        for entry in os.listdir(self.cache_dir):
+            if entry != keep and not entry.startswith('.tmp-'):
+                shutil.rmtree(os.path.join(self.cache_dir, entry), ignore_errors=True)
+
+    def load_cache(self, cache_path):
+        columns = {field: np.load(os.path.join(cache_path, f'element_{field}.npy'), mmap_mode='r')
+                   for field in ELEMENT_FIELDS}
+        elements = [dict(zip(ELEMENT_FIELDS, row))
+                    for row in zip(*(columns[field].tolist() for field in ELEMENT_FIELDS))]
+        with open(os.path.join(cache_path, 'catalog.json'), encoding='utf-8') as f:
+            compiled = json.load(f)
+        lines = LineDatabase.load(cache_path) if compiled['spectral_data'] else None
+        return elements, compiled['epochs'], compiled['spectral_data'], lines
+
+
+def open_source(spec=None):
+    """Source désignée par 'builtin' (ou rien) ou par le chemin d'un répertoire de données"""
+    if not spec or spec == 'builtin':
+        return BuiltinSource()
+    if not os.path.isdir(spec):
+        raise DatasetError(f"Répertoire de données introuvable: {spec}")
+    return FileSource(spec)
+
+
+def load_catalog_from(source):
+    """Construit le catalogue immuable à partir d'une source"""
+    return ElementCatalog(*source.read())
@@ -0,0 +1,140 @@
+"""Enregistrements compacts du catalogue: éléments, époques, raies spectrales
+
+Chaque enregistrement est un objet immuable à __slots__, sans __dict__. Les
+chaînes qui se répètent d'un enregistrement à l'autre (symboles, époques,
+découvreurs) sont internées et les longueurs d'onde sont des flottants.
+L'accès par clé (element['nom']) reste possible, comme pour les dicts
+qu'ils remplacent.
+"""
+import re
+import sys
+
+_LINE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*nm\s*(?:\((.*)\))?')
+
+
+def _intern(value):
+    return sys.intern(str(value))
+
+
+class Record:
+    """Base des enregistrements: immuables, lisibles par attribut ou par clé"""
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} attend {len(self.__slots__)} valeurs")
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} est immuable ('{name}')")
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def keys(self):
+        return self.__slots__
+
+    def items(self):
+        return zip(self.__slots__, self.values())
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.__slots__ else default
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.values() == other.values()
+
+    def __hash__(self):
+        return hash(self.values())
+
+    def __reduce__(self):
+        return type(self), self.values()
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in self.items())})"
+
+    def plain(self):
+        """Forme sérialisable en JSON (dicts, listes, nombres et chaînes)"""
+        return {name: _plain(value) for name, value in self.items()}
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.plain()
+    if isinstance(value, tuple):
+        return [_plain(v) for v in value]
+    return value
+
+
+class Element(Record):
+    """Élément chimique et sa découverte"""
+
+    __slots__ = ('symbole', 'nom', 'date_decouverte', 'decouvreur', 'periode_epoch')
+
+    @classmethod
+    def from_mapping(cls, row):
+        return cls(_intern(row['symbole']), str(row['nom']), int(row['date_decouverte']),
+                   _intern(row['decouvreur']), _intern(row['periode_epoch']))
+
+
+class Epoch(Record):
+    """Époque historique et symboles de ses éléments"""
+
+    __slots__ = ('nom', 'periode', 'couleur', 'description', 'elements')
+
+    @classmethod
+    def from_mapping(cls, row):
+        return cls(_intern(row['nom']), str(row['periode']), _intern(row['couleur']),
+                   str(row['description']), tuple(_intern(symb) for symb in row['elements']))
+
+
+class SpectralLine(Record):
+    """Raie d'émission: longueur d'onde (nm) et annotation facultative, comme 'Hα'"""
+
+    __slots__ = ('longueur_onde', 'annotation')
+
+    @classmethod
+    def parse(cls, raie):
+        """Raie à partir de sa forme texte, comme '656.3 nm (Hα)'"""
+        if isinstance(raie, SpectralLine):
+            return raie
+        if isinstance(raie, (int, float)):
+            return cls(float(raie), None)
+        match = _LINE_PATTERN.search(raie)
+        if match is None:
+            raise ValueError(f"Raie spectrale illisible: {raie!r}")
+        annotation = match.group(2)
+        return cls(float(match.group(1)), _intern(annotation) if annotation else None)
+
+    def __float__(self):
+        return self.longueur_onde
+
+    def __str__(self):
+        text = f'{self.longueur_onde} nm'
+        return f'{text} ({self.annotation})' if self.annotation else text
+
+    def plain(self):
+        return str(self)
+
+
+class SpectralInfo(Record):
+    """Raie principale et raies caractéristiques d'un élément"""
+
+    __slots__ = ('longueur_onde_principale', 'raies')
+
+    @classmethod
+    def from_mapping(cls, row):
+        return cls(float(row['longueur_onde_principale']),
+                   tuple(SpectralLine.parse(raie) for raie in row['raies']))
@@ -0,0 +1,83 @@
+"""Actualisation du catalogue en arrière-plan, sans redémarrer le serveur
+
+Un thread surveille la source de données (signature peu coûteuse: dates et
+tailles des fichiers). Quand elle change, le nouveau catalogue est construit
+hors du chemin des requêtes, avec ses index, ses couleurs et les contenus des
+vues par défaut, puis remplace l'ancien par une seule affectation. Chaque
+rerun lit le catalogue courant une fois: une session termine son rerun (et
+ses fragments) sur l'ancienne version et passe à la nouvelle au rerun suivant.
+Une source invalide laisse la version courante en place.
+"""
+import logging
+import os
+import threading
+import time
+
+from loaders import load_catalog_from
+
+# Intervalle de surveillance des sources, en secondes (0 pour désactiver)
+REFRESH_INTERVAL_S = float(os.environ.get('DASHBOARD_REFRESH_S', 5))
+
+logger = logging.getLogger(__name__)
+
+
+class CatalogRefresher:
+    """Catalogue courant d'une source, remplacé en arrière-plan quand la source change"""
+
+    def __init__(self, source, interval=REFRESH_INTERVAL_S, warm=None):
+        self.source = source
+        self.interval = interval
+        self.warm = warm
+        self.refreshed_at = None
+        self.last_error = None
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        signature = source.signature()
+        # (signature de la source, catalogue): remplacé d'un bloc, jamais modifié sur place
+        self._current = (signature, load_catalog_from(source))
+
+    @property
+    def catalog(self):
+        return self._current[1]
+
+    def check(self):
+        """Reconstruit et publie le catalogue si la source a changé; vrai si une nouvelle version est publiée"""
+        with self._check_lock:
+            signature, current = self._current
+            try:
+                new_signature = self.source.signature()
+                if new_signature == signature:
+                    return False
+                catalog = load_catalog_from(self.source)
+                if self.warm is not None and catalog.version != current.version:
+                    self.warm(catalog)
+            except Exception as error:
+                # Source en cours d'écriture ou invalide: la version courante reste servie
+                self.last_error = f"{type(error).__name__}: {error}"
+                logger.warning("Actualisation du catalogue impossible: %s", self.last_error)
+                return False
+            self._current = (new_signature, catalog)
+            self.last_error = None
+            if catalog.version == current.version:
+                return False
+            self.refreshed_at = time.time()
+            logger.info("Catalogue actualisé: %s → %s", current.version, catalog.version)
+            return True
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return self
+        self._thread = threading.Thread(target=self._run, name='catalog-refresher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
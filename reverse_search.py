@@ -0,0 +1,164 @@
+"""Identification des éléments à partir d'un spectre mesuré
+
+Le fichier (CSV: longueur d'onde en nm, intensité) est lu par blocs; chaque
+bloc est réduit à ses pics, puis seuls les pics les plus intenses sont
+conservés. La mémoire utilisée reste donc bornée quelle que soit la taille du
+fichier. Les pics sont ensuite rapprochés des raies de la base par recherche
+dichotomique (line_database.LineDatabase.match_peaks). Le séparateur de
+colonnes (virgule, point-virgule, tabulation, espace) et le séparateur décimal
+sont détectés sur les premières lignes, comme pour un export de tableur.
+"""
+import csv
+import io
+import re
+
+import numpy as np
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# Lignes lues par bloc
+CHUNK_ROWS = 250_000
+
+# Nombre maximal de pics conservés sur l'ensemble du fichier
+MAX_PEAKS = 2000
+
+# Intensité minimale d'un pic, relative au pic le plus intense du fichier
+MIN_RELATIVE_INTENSITY = 0.05
+
+# Début du fichier examiné pour détecter son format (octets) et séparateurs de colonnes reconnus
+SNIFF_BYTES = 8192
+DELIMITERS = ',;\t '
+
+_DECIMAL_COMMA = re.compile(r'\d,\d')
+# Export de tableur français: '656,3;0,8', '656,3\t0,8' (le Sniffer y verrait des colonnes séparées par des virgules)
+_DECIMAL_COMMA_COLUMNS = re.compile(r'\d,\d+[ \t]*([;\t ])[ \t]*[-+]?\d')
+
+
+class SpectrumFormatError(ValueError):
+    """Fichier de spectre vide, illisible ou invalide"""
+
+
+def sniff_format(fileobj):
+    """(séparateur de colonnes, séparateur décimal, ligne d'en-tête ou None) du fichier"""
+    position = fileobj.tell()
+    sample = fileobj.read(SNIFF_BYTES)
+    fileobj.seek(position)
+    if isinstance(sample, bytes):
+        sample = sample.decode('utf-8', errors='replace')
+    lines = [line for line in sample.splitlines() if line.strip() and not line.lstrip().startswith('#')]
+    if not lines:
+        raise SpectrumFormatError("Fichier vide: aucune ligne de données")
+
+    french = next(filter(None, map(_DECIMAL_COMMA_COLUMNS.search, lines[:20])), None)
+    if french is not None:
+        delimiter = french.group(1)
+    else:
+        try:
+            delimiter = csv.Sniffer().sniff('\n'.join(lines[:20]), delimiters=DELIMITERS).delimiter
+        except csv.Error:
+            delimiter = ','
+    # Virgule décimale seulement si elle ne sert pas de séparateur (export de tableur français)
+    decimal = ',' if delimiter != ',' and any(_DECIMAL_COMMA.search(line) for line in lines[:20]) else '.'
+    sep = r'\s+' if delimiter in ' \t' else delimiter
+
+    first = lines[0].split() if sep == r'\s+' else lines[0].split(delimiter)
+    try:
+        [float(value.replace(decimal, '.')) for value in first[:2]]
+    except ValueError:
+        return sep, decimal, 0
+    return sep, decimal, None
+
+
+def read_spectrum_chunks(fileobj, chunk_rows=CHUNK_ROWS):
+    """Blocs (longueurs d'onde, intensités) d'un fichier CSV, sans le charger entièrement
+
+    Lève SpectrumFormatError si le fichier est vide ou si une ligne n'est pas numérique.
+    """
+    sep, decimal, header = sniff_format(fileobj)
+    try:
+        # Les erreurs de pandas (ParserError, EmptyDataError) dérivent de ValueError
+        reader = pd.read_csv(fileobj, sep=sep, decimal=decimal, header=header, usecols=[0, 1],
+                             comment='#', chunksize=chunk_rows, dtype=np.float64)
+        for chunk in reader:
+            values = chunk.to_numpy()
+            values = values[np.isfinite(values).all(axis=1)]
+            yield values[:, 0], values[:, 1]
+    except ValueError as error:
+        raise SpectrumFormatError(
+            f"Spectre illisible (deux colonnes numériques attendues: longueur d'onde en nm, intensité): {error}"
+        ) from error
+
+
+class PeakFinder:
+    """Détection vectorisée des maxima locaux, alimentée bloc par bloc"""
+
+    def __init__(self, max_peaks=MAX_PEAKS, noise_factor=5.0):
+        self.max_peaks = max_peaks
+        self.noise_factor = noise_factor
+        self.wavelengths = np.empty(0)
+        self.intensities = np.empty(0)
+        self.samples = 0
+        self.range = (np.inf, -np.inf)
+        # Deux derniers échantillons du bloc précédent, pour les pics à cheval sur deux blocs
+        self._tail = (np.empty(0), np.empty(0))
+
+    def feed(self, wavelengths, intensities):
+        if not len(wavelengths):
+            return
+        self.samples += len(wavelengths)
+        self.range = (min(self.range[0], wavelengths.min()), max(self.range[1], wavelengths.max()))
+        x = np.concatenate([self._tail[0], wavelengths])
+        y = np.concatenate([self._tail[1], intensities])
+        self._tail = (x[-2:], y[-2:])
+        if len(y) < 3:
+            return
+
+        # Seuil de bruit du bloc: médiane + k × écart absolu médian
+        median = np.median(y)
+        noise = np.median(np.abs(y - median))
+        threshold = median + self.noise_factor * max(noise, 1e-12)
+        center = y[1:-1]
+        is_peak = (center > y[:-2]) & (center >= y[2:]) & (center > threshold)
+        found = np.flatnonzero(is_peak) + 1
+
+        self.wavelengths = np.concatenate([self.wavelengths, x[found]])
+        self.intensities = np.concatenate([self.intensities, y[found]])
+        if len(self.intensities) > self.max_peaks:
+            keep = np.argpartition(-self.intensities, self.max_peaks)[:self.max_peaks]
+            self.wavelengths, self.intensities = self.wavelengths[keep], self.intensities[keep]
+
+    def peaks(self, min_relative=MIN_RELATIVE_INTENSITY):
+        """Pics retenus, triés par longueur d'onde, avec intensités normalisées à 1"""
+        order = np.argsort(self.wavelengths)
+        wavelengths, intensities = self.wavelengths[order], self.intensities[order]
+        if len(intensities):
+            intensities = intensities / intensities.max()
+        strong = intensities >= min_relative
+        return wavelengths[strong], intensities[strong]
+
+
+def identify_elements(fileobj, lines, tolerance=0.5, progress=None, chunk_rows=CHUNK_ROWS):
+    """Classe les éléments de la base selon leur correspondance avec le spectre du fichier
+
+    progress, s'il est fourni, est appelé avec la fraction du fichier déjà lue.
+    Lève SpectrumFormatError si le fichier ne contient pas de spectre lisible.
+    """
+    if isinstance(fileobj, (bytes, bytearray)):
+        fileobj = io.BytesIO(fileobj)
+    fileobj.seek(0, io.SEEK_END)
+    size = fileobj.tell() or 1
+    fileobj.seek(0)
+
+    finder = PeakFinder()
+    for wavelengths, intensities in read_spectrum_chunks(fileobj, chunk_rows):
+        finder.feed(wavelengths, intensities)
+        if progress is not None:
+            progress(min(fileobj.tell() / size, 1.0))
+
+    if not finder.samples:
+        raise SpectrumFormatError("Aucun échantillon numérique dans le fichier")
+    peak_wavelengths, peak_intensities = finder.peaks()
+    ranking = lines.match_peaks(peak_wavelengths, peak_intensities, tolerance, finder.range)
+    return ranking, (peak_wavelengths, peak_intensities), finder.samples
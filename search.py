@@ -0,0 +1,172 @@
+"""Index de recherche plein texte et approchée sur les éléments du catalogue
+
+Chaque élément est indexé par son symbole, son nom, son découvreur, son
+époque et les longueurs d'onde de ses raies. Les textes sont ramenés en
+minuscules sans accents ('Hélium' et 'Helium', 'Jâbir' et 'Jabir' donnent le
+même mot). L'index inversé est stocké en tableaux NumPy: le vocabulaire est
+trié, donc les mots d'un même préfixe sont contigus et leurs listes
+d'éléments forment un seul intervalle. Les fautes de frappe sont rattrapées
+par les trigrammes des mots (similarité de Dice). Une requête ne parcourt
+que les listes des mots qui lui correspondent, sans boucle sur les éléments.
+"""
+import re
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+# Poids des champs: un symbole exact prime sur un nom, un nom sur un découvreur, etc.
+FIELD_WEIGHTS = {'symbole': 8.0, 'nom': 4.0, 'decouvreur': 2.0, 'raies': 1.5, 'periode_epoch': 1.0}
+
+# Qualité d'une correspondance: mot exact, préfixe d'un mot, mot approché (× similarité)
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.6
+FUZZY_MATCH = 0.5
+
+# Similarité minimale des trigrammes et nombre maximal de mots approchés retenus par terme
+MIN_SIMILARITY = 0.45
+MAX_FUZZY_TOKENS = 32
+
+_TOKEN_PATTERN = re.compile(r'\d+(?:\.\d+)?|[^\W_]+')
+_DECIMAL_COMMA = re.compile(r'(\d),(\d)')
+_LIGATURES = str.maketrans({'œ': 'oe', 'æ': 'ae', 'ß': 'ss', 'ø': 'o', 'ł': 'l', 'đ': 'd'})
+
+
+def fold(text):
+    """Texte en minuscules et sans accents: 'Jâbir' → 'jabir'"""
+    text = str(text)
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text.lower().translate(_LIGATURES))
+    return ''.join(c for c in text if not unicodedata.combining(c))
+
+
+def tokenize(text):
+    """Mots normalisés d'un texte; les nombres décimaux ('656.3', '656,3') restent entiers"""
+    text = fold(text)
+    if ',' in text:
+        text = _DECIMAL_COMMA.sub(r'\1.\2', text)
+    return _TOKEN_PATTERN.findall(text)
+
+
+def trigrams(token):
+    padded = f' {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _fuzzy(token):
+    """Vrai si le mot admet une correspondance approchée (les nombres n'en ont pas)"""
+    return not token[0].isdigit()
+
+
+class SearchIndex:
+    """Index inversé des éléments, avec recherche par mot, par préfixe et approchée"""
+
+    def __init__(self, elements_data, spectral_data):
+        # Mot → {élément: poids du meilleur champ où il apparaît}
+        postings = {}
+        # Découvreurs et époques se répètent: chaque texte n'est découpé qu'une fois
+        tokens = {}
+        for doc, element in enumerate(elements_data):
+            fields = [(field, element[field]) for field in ('symbole', 'nom', 'decouvreur', 'periode_epoch')]
+            spectral_info = spectral_data.get(element.symbole)
+            if spectral_info is not None:
+                fields.append(('raies', ' '.join(
+                    [str(spectral_info.longueur_onde_principale), *map(str, spectral_info.raies)])))
+            for field, text in fields:
+                weight = FIELD_WEIGHTS[field]
+                words = tokens.get(text)
+                if words is None:
+                    words = tokens[text] = tokenize(text)
+                for token in words:
+                    docs = postings.setdefault(token, {})
+                    if docs.get(doc, 0.0) < weight:
+                        docs[doc] = weight
+
+        self.size = len(elements_data)
+        self.vocabulary = sorted(postings)
+        # Éléments du mot i: documents[offsets[i]:offsets[i + 1]], avec leurs poids
+        lengths = np.array([len(postings[token]) for token in self.vocabulary], dtype=np.int64)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths)))
+        self.documents = np.fromiter(
+            (doc for token in self.vocabulary for doc in postings[token]), dtype=np.int32, count=self.offsets[-1])
+        self.weights = np.fromiter(
+            (w for token in self.vocabulary for w in postings[token].values()), dtype=np.float32,
+            count=self.offsets[-1])
+
+        # Trigramme → identifiants des mots qui le contiennent
+        grams = {}
+        gram_counts = np.zeros(len(self.vocabulary), dtype=np.int32)
+        for token_id, token in enumerate(self.vocabulary):
+            if _fuzzy(token):
+                token_grams = trigrams(token)
+                gram_counts[token_id] = len(token_grams)
+                for gram in token_grams:
+                    grams.setdefault(gram, []).append(token_id)
+        self.grams = {gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()}
+        self.gram_counts = gram_counts
+
+    def __len__(self):
+        return len(self.vocabulary)
+
+    def _postings(self, lo, hi):
+        start, end = self.offsets[lo], self.offsets[hi]
+        return self.documents[start:end], self.weights[start:end]
+
+    def term_scores(self, term):
+        """Score de chaque élément pour un terme: meilleure correspondance, pondérée par le champ"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        lo = bisect_left(self.vocabulary, term)
+        hi = bisect_left(self.vocabulary, term + '\uffff', lo)
+        if lo < hi:
+            documents, weights = self._postings(lo, hi)
+            np.maximum.at(scores, documents, weights * PREFIX_MATCH)
+            if self.vocabulary[lo] == term:
+                # Un élément n'apparaît qu'une fois par mot: affectation directe
+                documents, weights = self._postings(lo, lo + 1)
+                scores[documents] = np.maximum(scores[documents], weights * EXACT_MATCH)
+
+        if len(term) >= 3 and _fuzzy(term):
+            term_grams = trigrams(term)
+            matches = [self.grams[gram] for gram in term_grams if gram in self.grams]
+            if matches:
+                shared = np.bincount(np.concatenate(matches), minlength=len(self.vocabulary))
+                candidates = np.flatnonzero(shared)
+                similarity = 2 * shared[candidates] / (len(term_grams) + self.gram_counts[candidates])
+                keep = (similarity >= MIN_SIMILARITY) & ((candidates < lo) | (candidates >= hi))
+                candidates, similarity = candidates[keep], similarity[keep]
+                if len(candidates) > MAX_FUZZY_TOKENS:
+                    best = np.argpartition(-similarity, MAX_FUZZY_TOKENS)[:MAX_FUZZY_TOKENS]
+                    candidates, similarity = candidates[best], similarity[best]
+                if len(candidates):
+                    slices = [self._postings(token_id, token_id + 1) for token_id in candidates]
+                    documents = np.concatenate([docs for docs, _ in slices])
+                    factors = np.repeat(similarity * FUZZY_MATCH, [len(docs) for docs, _ in slices])
+                    weights = np.concatenate([w for _, w in slices]) * factors
+                    np.maximum.at(scores, documents, weights.astype(np.float32))
+        return scores
+
+    def find(self, query, limit=20):
+        """Indices des éléments les plus pertinents pour la requête, et leurs scores
+
+        Seuls les éléments qui correspondent au plus grand nombre de termes
+        sont retenus (tous les termes si possible: 'na 589' ne donne que le
+        sodium, 'Marie Curie' donne encore le radium). À score égal, l'ordre
+        du catalogue est conservé.
+        """
+        total = np.zeros(self.size, dtype=np.float32)
+        matched = np.zeros(self.size, dtype=np.int16)
+        for term in dict.fromkeys(tokenize(query)):
+            scores = self.term_scores(term)
+            total += scores
+            matched += scores > 0
+        candidates = np.flatnonzero(matched == matched.max()) if matched.any() else np.empty(0, dtype=np.int64)
+        if len(candidates) > limit:
+            # Les limit meilleurs; à égalité au seuil, les premiers dans l'ordre du catalogue
+            scores = total[candidates]
+            threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+            above = candidates[scores > threshold]
+            ties = candidates[scores == threshold][:limit - len(above)]
+            candidates = np.sort(np.concatenate((above, ties)))
+        order = np.argsort(-total[candidates], kind='stable')
+        return candidates[order], total[candidates[order]]
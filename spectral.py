@@ -0,0 +1,211 @@
+"""Simulation des spectres d'émission à partir des raies du catalogue"""
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from records import SpectralLine
+
+# Domaine visible, en nm
+VISIBLE_RANGE = (380.0, 780.0)
+
+# Intensités relatives de la raie principale et des raies secondaires
+MAIN_LINE_INTENSITY = 0.8
+SECONDARY_LINE_INTENSITY = 0.3
+
+# Configurations (résolution, largeur de raie) conservées en cache pour chaque élément:
+# couleurs du catalogue et spectres de l'explorateur
+CACHED_CONFIGURATIONS = 2
+
+def parse_wavelength(raie):
+    """Longueur d'onde (nm) d'une raie comme '656.3 nm (Hα)' ou records.SpectralLine"""
+    return float(SpectralLine.parse(raie))
+
+
+def parse_lines(spectral_info):
+    """Longueurs d'onde et intensités relatives des raies d'un élément"""
+    principale = float(spectral_info['longueur_onde_principale'])
+    wavelengths, intensities = [principale], [MAIN_LINE_INTENSITY]
+    for raie in spectral_info['raies']:
+        wavelength = parse_wavelength(raie)
+        if abs(wavelength - principale) > 0.05:
+            wavelengths.append(wavelength)
+            intensities.append(SECONDARY_LINE_INTENSITY)
+    return tuple(wavelengths), tuple(intensities)
+
+
+class SpectralEngine:
+    """Génère des spectres simulés par lots, avec un cache LRU partagé
+
+    Le cache est dimensionné sur le catalogue: un lot couvrant tous les éléments
+    ne chasse pas ses propres résultats. Les éléments sans raie ont un spectre
+    nul, qui n'occupe pas le cache.
+    """
+
+    def __init__(self, spectral_data, cache_size=None):
+        self.lines = {symb: parse_lines(info) for symb, info in spectral_data.items()}
+        self.cache_size = cache_size if cache_size is not None else CACHED_CONFIGURATIONS * max(len(self.lines), 1)
+        self._cache = OrderedDict()
+        self._grids = {}
+        self._lock = threading.Lock()
+
+    def grid(self, resolution=400):
+        """Longueurs d'onde échantillonnées sur le domaine visible"""
+        grid = self._grids.get(resolution)
+        if grid is None:
+            grid = np.linspace(*VISIBLE_RANGE, resolution)
+            grid.setflags(write=False)
+            self._grids[resolution] = grid
+        return grid
+
+    def _line_matrix(self, symbols):
+        """Positions et intensités des raies, complétées par des zéros (éléments × raies)"""
+        width = max((len(self.lines.get(symb, ((), ()))[0]) for symb in symbols), default=0)
+        positions = np.zeros((len(symbols), max(width, 1)))
+        intensities = np.zeros_like(positions)
+        for row, symb in enumerate(symbols):
+            wavelengths, amplitudes = self.lines.get(symb, ((), ()))
+            positions[row, :len(wavelengths)] = wavelengths
+            intensities[row, :len(amplitudes)] = amplitudes
+        return positions, intensities
+
+    def compute(self, symbols, resolution=400, line_width=10.0, chunk_size=1024):
+        """Calcule sans cache les spectres de plusieurs éléments (éléments × longueurs d'onde)"""
+        grid = self.grid(resolution)
+        positions, intensities = self._line_matrix(symbols)
+        result = np.empty((len(symbols), resolution))
+        # Par blocs d'éléments, pour borner le tableau intermédiaire éléments × raies × longueurs d'onde
+        for start in range(0, len(symbols), chunk_size):
+            block = slice(start, start + chunk_size)
+            offsets = (grid[None, None, :] - positions[block, :, None]) / line_width
+            result[block] = np.einsum('el,elw->ew', intensities[block], np.exp(-0.5 * offsets ** 2))
+        return result
+
+    def spectra(self, symbols, resolution=400, line_width=10.0):
+        """Spectres de plusieurs éléments, calculés en un seul lot pour ceux absents du cache
+
+        Un lot plus grand que le cache est calculé sans y être conservé.
+        """
+        symbols = list(symbols)
+        result = np.zeros((len(symbols), resolution))
+        missing = []
+        with self._lock:
+            for row, symb in enumerate(symbols):
+                if symb not in self.lines:
+                    continue
+                cached = self._cache.get((symb, resolution, line_width))
+                if cached is None:
+                    missing.append(row)
+                else:
+                    self._cache.move_to_end((symb, resolution, line_width))
+                    result[row] = cached
+
+        if missing:
+            computed = self.compute([symbols[row] for row in missing], resolution, line_width)
+            if len(missing) > self.cache_size:
+                result[missing] = computed
+                return result
+            with self._lock:
+                for row, spectrum in zip(missing, computed):
+                    result[row] = spectrum
+                    spectrum.setflags(write=False)
+                    self._cache[(symbols[row], resolution, line_width)] = spectrum
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def spectrum(self, symbol, resolution=400, line_width=10.0):
+        """Spectre simulé d'un seul élément"""
+        return self.spectra([symbol], resolution, line_width)[0]
+
+
+def overlap_matrix(spectra):
+    """Recouvrement deux à deux de spectres (similarité cosinus), en un seul produit matriciel
+
+    Les spectres étant positifs, le recouvrement est compris entre 0 et 1;
+    un spectre nul (élément sans raie) ne recouvre aucun autre.
+    """
+    norms = np.linalg.norm(spectra, axis=1, keepdims=True)
+    unit = np.divide(spectra, norms, out=np.zeros_like(spectra, dtype=float), where=norms > 0)
+    return unit @ unit.T
+
+
+# Matrice XYZ → sRGB linéaire (illuminant D65)
+XYZ_TO_LINEAR_SRGB = np.array([
+    [3.2406, -1.5372, -0.4986],
+    [-0.9689, 1.8758, 0.0415],
+    [0.0557, -0.2040, 1.0570],
+])
+
+
+# Fonctions colorimétriques CIE 1931 (observateur 2°), de 380 à 780 nm par pas de 10 nm: x̄, ȳ, z̄
+CIE_1931_STEP = 10
+CIE_1931_CMF = np.array([
+    (0.001368, 0.000039, 0.006450), (0.004243, 0.000120, 0.020050), (0.014310, 0.000396, 0.067850),
+    (0.043510, 0.001210, 0.207400), (0.134380, 0.004000, 0.645600), (0.283900, 0.011600, 1.385600),
+    (0.348280, 0.023000, 1.747060), (0.336200, 0.038000, 1.772110), (0.290800, 0.060000, 1.669200),
+    (0.195360, 0.090980, 1.287640), (0.095640, 0.139020, 0.812950), (0.032010, 0.208020, 0.465180),
+    (0.004900, 0.323000, 0.272000), (0.009300, 0.503000, 0.158200), (0.063270, 0.710000, 0.078250),
+    (0.165500, 0.862000, 0.042160), (0.290400, 0.954000, 0.020300), (0.433450, 0.994950, 0.008750),
+    (0.594500, 0.995000, 0.003900), (0.762100, 0.952000, 0.002100), (0.916300, 0.870000, 0.001650),
+    (1.026300, 0.757000, 0.001100), (1.062200, 0.631000, 0.000800), (1.002600, 0.503000, 0.000340),
+    (0.854450, 0.381000, 0.000190), (0.642400, 0.265000, 0.000050), (0.447900, 0.175000, 0.000020),
+    (0.283500, 0.107000, 0.000000), (0.164900, 0.061000, 0.000000), (0.087400, 0.032000, 0.000000),
+    (0.046770, 0.017000, 0.000000), (0.022700, 0.008210, 0.000000), (0.011359, 0.004102, 0.000000),
+    (0.005790, 0.002091, 0.000000), (0.002899, 0.001047, 0.000000), (0.001440, 0.000520, 0.000000),
+    (0.000690, 0.000249, 0.000000), (0.000332, 0.000120, 0.000000), (0.000166, 0.000060, 0.000000),
+    (0.000083, 0.000030, 0.000000), (0.000042, 0.000015, 0.000000),
+])
+
+
+def cie_color_matching(wavelengths):
+    """Fonctions colorimétriques CIE 1931 interpolées sur des longueurs d'onde (longueurs d'onde × 3)"""
+    table = np.arange(VISIBLE_RANGE[0], VISIBLE_RANGE[1] + 1, CIE_1931_STEP)
+    return np.stack([np.interp(wavelengths, table, CIE_1931_CMF[:, i], left=0, right=0)
+                     for i in range(3)], axis=1)
+
+
+def srgb_encode(linear):
+    """Correction gamma sRGB d'intensités linéaires dans [0, 1]"""
+    return np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * np.power(linear, 1 / 2.4) - 0.055)
+
+
+class ColorEngine:
+    """Conversion vectorisée de spectres d'émission en couleurs sRGB"""
+
+    def __init__(self, resolution=401):
+        self.resolution = resolution
+        self.wavelengths = np.linspace(*VISIBLE_RANGE, resolution)
+        # Intégration CIE et passage en sRGB linéaire réunis dans une seule matrice (longueurs d'onde × 3)
+        self.matrix = cie_color_matching(self.wavelengths) @ XYZ_TO_LINEAR_SRGB.T
+        # Table des couleurs des raies monochromatiques, une ligne par longueur d'onde
+        self.lut = self.spectra_to_rgb(np.eye(resolution))
+        self.lut.setflags(write=False)
+
+    def spectra_to_rgb(self, spectra):
+        """Couleurs sRGB 8 bits de spectres échantillonnés sur self.wavelengths (éléments × 3)"""
+        linear = np.atleast_2d(spectra) @ self.matrix
+        # Hors gamut: composantes négatives ramenées à zéro, puis luminosité normalisée
+        np.clip(linear, 0, None, out=linear)
+        peak = linear.max(axis=1, keepdims=True)
+        np.divide(linear, peak, out=linear, where=peak > 0)
+        return np.rint(srgb_encode(np.clip(linear, 0, 1)) * 255).astype(np.uint8)
+
+    def wavelength_to_rgb(self, wavelengths):
+        """Couleurs des raies monochromatiques, lues dans la table précalculée"""
+        step = (VISIBLE_RANGE[1] - VISIBLE_RANGE[0]) / (self.resolution - 1)
+        rows = np.rint((np.asarray(wavelengths, dtype=float) - VISIBLE_RANGE[0]) / step).astype(int)
+        return self.lut[np.clip(rows, 0, self.resolution - 1)]
+
+    def element_colors(self, spectral_engine, symbols, line_width=10.0):
+        """Couleurs des éléments, calculées d'un bloc à partir de leurs spectres simulés"""
+        symbols = list(symbols)
+        spectra = spectral_engine.spectra(symbols, self.resolution, line_width)
+        return dict(zip(symbols, map(tuple, self.spectra_to_rgb(spectra).tolist())))
+
+
+@functools.lru_cache(maxsize=None)
+def default_color_engine(resolution=401):
+    """Moteur de couleurs partagé, dont la table est calculée une fois par processus"""
+    return ColorEngine(resolution)
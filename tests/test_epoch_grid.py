@@ -0,0 +1,11 @@
+"""Grille des époques: un message par époque, quel que soit le nombre d'éléments"""
+import pytest
+
+from benchmark import bench_epoch_overview_deltas
+from catalog import define_historical_epochs
+
+
+@pytest.mark.parametrize('size', [40, 118, 1000])
+def test_deltas_scale_with_epochs(size):
+    # Titre de la section, puis un bloc HTML par époque
+    assert bench_epoch_overview_deltas(size) == 1 + len(define_historical_epochs())
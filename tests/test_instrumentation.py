@@ -0,0 +1,36 @@
+"""Export Prometheus: chaque famille de métriques forme un bloc contigu, typé"""
+import re
+
+from instrumentation import Profiler
+
+
+class View:
+    def build_figure(self):
+        return sum(range(1000))
+
+    def create_view(self):
+        return self.build_figure()
+
+
+def test_prometheus_families_are_contiguous_and_typed():
+    profiler = Profiler(enabled=True, memory=True)
+    profiler.instrument(View, lambda name: True)
+    for _ in range(3):
+        with profiler.rerun({}):
+            View().create_view()
+
+    typed, families = set(), []
+    for line in profiler.to_prometheus().splitlines():
+        if line.startswith('# TYPE'):
+            typed.add(line.split()[2])
+            continue
+        if line.startswith('#'):
+            continue
+        name = re.match(r'[a-z_]+', line).group(0)
+        family = re.sub(r'_(sum|count)$', '', name)
+        family = family if family in typed else name
+        assert family in typed, line
+        if not families or families[-1] != family:
+            families.append(family)
+    assert len(families) == len(set(families)), families
+    assert 'dashboard_method_calls_total' in families and 'dashboard_method_alloc_bytes' in families
@@ -0,0 +1,25 @@
+"""Enregistrements compacts du catalogue: mémoire retenue, chaînes internées, longueurs d'onde flottantes"""
+from benchmark import _element_rows, _spectral_rows, bench_record_memory
+from records import Element, SpectralInfo
+
+
+def test_records_retain_less_memory_than_dicts():
+    memory = bench_record_memory(10000)
+    assert memory['elements_records'] < memory['elements_dict']
+    assert memory['spectral_records'] < memory['spectral_dict']
+
+
+def test_shared_strings_are_interned():
+    # Lignes 0 et 582 (= 97 × 6): même découvreur et même époque, lus comme des chaînes distinctes
+    rows = list(_element_rows(583))
+    first, second = Element.from_mapping(rows[0]), Element.from_mapping(rows[582])
+    assert first.decouvreur == second.decouvreur
+    assert first.decouvreur is second.decouvreur
+    assert first.periode_epoch is second.periode_epoch
+
+
+def test_wavelengths_are_floats():
+    info = SpectralInfo.from_mapping(next(_spectral_rows(1)))
+    assert isinstance(info.longueur_onde_principale, float)
+    assert all(isinstance(raie.longueur_onde, float) for raie in info.raies)
+    assert info.raies[1].annotation == 'raie 0'
@@ -0,0 +1,46 @@
+"""Lecture des spectres déposés: formats de tableur reconnus et fichiers refusés avec SpectrumFormatError"""
+import io
+
+import numpy as np
+import pytest
+
+from loaders import load_catalog_from, open_source
+from reverse_search import SpectrumFormatError, identify_elements, sniff_format
+
+LINES = load_catalog_from(open_source(None)).lines
+
+
+def sodium_spectrum(delimiter=',', decimal='.'):
+    """Spectre bruité dont les pics sont les deux raies D du sodium"""
+    x = np.linspace(550, 620, 5000)
+    y = np.random.default_rng(0).normal(0, 0.01, x.size)
+    for wavelength, amplitude in ((589.0, 1.0), (589.6, 0.5)):
+        y += amplitude * np.exp(-0.5 * ((x - wavelength) / 0.05) ** 2)
+    rows = (f'{w:.4f}{delimiter}{i:.5f}' for w, i in zip(x, y))
+    return '\n'.join(row.replace('.', decimal) for row in rows).encode('utf-8')
+
+
+def test_french_spreadsheet_export():
+    data = b'656,3;0,8\n656,4;0,1\n589,0;0,9\n'
+    assert sniff_format(io.BytesIO(data)) == (';', ',', None)
+    _, _, samples = identify_elements(data, LINES)
+    assert samples == 3
+
+
+@pytest.mark.parametrize('delimiter, decimal', [(',', '.'), (';', ','), ('\t', ','), ('\t', '.'), (' ', ',')])
+def test_formats_identify_the_same_element(delimiter, decimal):
+    ranking, _, samples = identify_elements(sodium_spectrum(delimiter, decimal), LINES, tolerance=0.2)
+    assert samples == 5000
+    assert ranking[0]['symbole'] == 'Na'
+
+
+@pytest.mark.parametrize('data, message', [
+    (b'', "Fichier vide"),
+    (b'# commentaire\n\n', "Fichier vide"),
+    (b'longueur,intensite\nrouge,fort\n', "Spectre illisible"),
+    (b'longueur;intensite\n', "Aucun échantillon"),
+    (b'656.3\n656.4\n589.0\n', "Spectre illisible"),
+])
+def test_unreadable_files_raise_format_error(data, message):
+    with pytest.raises(SpectrumFormatError, match=message):
+        identify_elements(data, LINES)
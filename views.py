@@ -0,0 +1,600 @@
+"""Contenu des vues du dashboard, sans Streamlit
+
+CSS et blocs HTML de la page, figures Plotly, statistiques et options des
+widgets, construits à partir du catalogue et conservés dans les caches
+partagés (figures.py). Dashboard.py les affiche avec Streamlit; l'export
+statique (export_static.py) les embarque dans ses pages sans charger
+Streamlit ni exécuter le script du dashboard.
+"""
+from datetime import date
+
+import numpy as np
+
+from catalog import DEFAULT_RGB, rgb_to_hex, periodic_positions
+from figures import FIGURE_CACHE, FRAGMENT_CACHE, bin_events
+from instrumentation import PROFILER
+from lazy_imports import lazy_import
+from spectral import VISIBLE_RANGE, overlap_matrix
+
+go = lazy_import('plotly.graph_objects')
+
+# CSS personnalisé de la page
+PAGE_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        background: linear-gradient(45deg, #8B4513, #D2691E, #CD853F);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        text-align: center;
+        margin-bottom: 2rem;
+        font-weight: bold;
+    }
+    .section-header {
+        color: #8B4513;
+        border-bottom: 2px solid #D2691E;
+        padding-bottom: 0.5rem;
+        margin-top: 2rem;
+        font-weight: bold;
+    }
+    .epoch-antique { 
+        background-color: #F5DEB3; 
+        border-left: 5px solid #8B4513; 
+        color: #333;
+    }
+    .epoch-moyenage { 
+        background-color: #DEB887; 
+        border-left: 5px solid #A0522D; 
+        color: #333;
+    }
+    .epoch-renaissance { 
+        background-color: #F4A460; 
+        border-left: 5px solid #D2691E; 
+        color: #333;
+    }
+    .epoch-revolution { 
+        background-color: #CD853F; 
+        border-left: 5px solid #8B4513; 
+        color: white;
+    }
+    .epoch-spectro { 
+        background-color: #D2691E; 
+        border-left: 5px solid #A52A2A; 
+        color: white;
+    }
+    .epoch-moderne { 
+        background-color: #A0522D; 
+        border-left: 5px solid #8B0000; 
+        color: white;
+    }
+    .discovery-card {
+        background-color: #f8f9fa;
+        padding: 1rem;
+        border-radius: 10px;
+        margin: 0.5rem 0;
+        border: 1px solid #ddd;
+        color: #333333;
+    }
+    .discovery-grid {
+        display: grid;
+        grid-template-columns: repeat(6, minmax(0, 1fr));
+        gap: 0 1rem;
+    }
+    .rgb-spectrum {
+        height: 20px;
+        border-radius: 10px;
+        margin: 5px 0;
+        border: 1px solid #ccc;
+    }
+    .timeline-period {
+        padding: 0.5rem;
+        border-radius: 5px;
+        text-align: center;
+        margin: 0.2rem;
+        font-weight: bold;
+    }
+</style>
+"""
+
+HEADER_HTML = """
+<h1 class="main-header">🕰️ Tableau Périodique par Date de Découverte</h1>
+<div style='text-align: center; color: #666; margin-bottom: 2rem;'>
+<strong>Classification historique des éléments avec leurs spectres RGB caractéristiques</strong><br>
+Explorez l'histoire de la découverte des éléments et leurs signatures spectrales
+</div>
+"""
+
+FOOTER_HTML = """
+<div style='text-align: center; color: #666;'>
+<strong>Tableau Périodique Historique avec Spectres RGB</strong><br>
+Classification des éléments par date de découverte et analyse de leurs signatures spectrales caractéristiques<br>
+Données historiques et spectrales compilées pour l'étude de l'évolution de la chimie
+</div>
+"""
+
+# Échantillonnage des spectres simulés
+SPECTRUM_RESOLUTION = 400
+SPECTRUM_LINE_WIDTH = 10.0
+LINE_PLOT_BINS = 400
+
+# Comparaison: nombre de paires les plus proches listées
+COMPARISON_PAIRS = 10
+
+# Frise chronologique: rendu WebGL et regroupement par colonne de pixels au-delà de ces seuils
+PRESENT_YEAR = date.today().year
+WEBGL_THRESHOLD = 1000
+MAX_TIMELINE_POINTS = 5000
+TIMELINE_COLUMNS = 1200
+
+# Lecture animée: nombre maximal d'images et durée de chacune (ms)
+MAX_PLAYBACK_FRAMES = 150
+PLAYBACK_FRAME_MS = 200
+# Éléments rejoués au plus (les premiers découverts): chaque image liste les éléments déjà visibles
+MAX_PLAYBACK_ELEMENTS = 300
+
+
+def selection_key(selection):
+    """Forme compacte et hachable d'un masque de sélection, pour les clés de cache"""
+    return None if selection is None else np.packbits(selection).tobytes()
+
+
+class DashboardViews:
+    """Vues du dashboard pour une version du catalogue: figures, blocs HTML et statistiques"""
+
+    def __init__(self, catalog):
+        # Le catalogue est partagé par référence entre toutes les sessions
+        self.catalog = catalog
+        self.elements_data = self.catalog.elements_data
+        self.epochs_data = self.catalog.epochs_data
+        self.spectral_data = self.catalog.spectral_data
+        self.index = self.catalog.index
+        self.columns = self.catalog.columns
+        self.spectra = self.catalog.spectra
+        self.colors = self.catalog.colors
+        self.lines = self.catalog.lines
+
+    def get_element_rgb(self, element_symb):
+        """Retourne la couleur RGB d'un élément"""
+        return self.index.element_rgb(element_symb)
+
+    def cached_figure(self, view, filters, build):
+        """Figure du cache partagé, construite au premier affichage"""
+        return FIGURE_CACHE.get((view, filters, self.catalog.version), build)
+
+    def cached_fragment(self, view, inputs, build):
+        """Contenu d'une vue (HTML, statistiques), recalculé seulement si ses entrées ou les données changent"""
+        return FRAGMENT_CACHE.get((view, inputs, self.catalog.version), build)
+
+    def prepare_views(self, selection):
+        """Remplit les caches des vues pour une sélection, avec les clés utilisées à l'affichage"""
+        self.timeline_figure(selection, 'signed', self.timeline_bounds(selection))
+        self.epoch_blocks(selection)
+        self.palette_figure(selection)
+        self.explorer_options(selection)
+
+    def epoch_color(self, code):
+        """Couleur d'une époque à partir de son code dans le stockage en colonnes"""
+        return self.epochs_data[code]['couleur'] if code < len(self.epochs_data) else rgb_to_hex(DEFAULT_RGB)
+
+    def build_timeline_figure(self, selection=None, axis='signed', window=None):
+        """Construit la frise chronologique des éléments sélectionnés
+
+        L'axe est en années signées (négatives avant notre ère) ou en années avant
+        aujourd'hui sur une échelle logarithmique. Au-delà de MAX_TIMELINE_POINTS
+        événements, ils sont regroupés par colonne de pixels et par époque.
+        """
+        cols = self.columns
+        indices = np.arange(len(cols)) if selection is None else np.flatnonzero(selection)
+        if window is not None:
+            years = cols.years[indices]
+            indices = indices[(years >= window[0]) & (years <= window[1])]
+        years = cols.years[indices]
+        codes = cols.epoch_codes[indices]
+        log_axis = axis == 'log'
+        x = PRESENT_YEAR - years + 1 if log_axis else years
+
+        trace_type = go.Scattergl if len(indices) > WEBGL_THRESHOLD else go.Scatter
+        binned = len(indices) > MAX_TIMELINE_POINTS
+        if binned:
+            lo, hi = x.min(), x.max() + 1
+            edges = np.geomspace(lo, hi, TIMELINE_COLUMNS + 1) if log_axis else np.linspace(lo, hi, TIMELINE_COLUMNS + 1)
+            centers = np.sqrt(edges[:-1] * edges[1:]) if log_axis else (edges[:-1] + edges[1:]) / 2
+            counts = bin_events(x, codes, len(cols.epoch_names), edges)
+
+        fig = go.Figure()
+        for code, epoch_name in enumerate(cols.epoch_names):
+            marker = dict(size=12, color=self.epoch_color(code), line=dict(width=2, color='DarkSlateGrey'))
+            if binned:
+                # Un point par colonne occupée, dont la taille croît avec le nombre de découvertes
+                occupied = np.flatnonzero(counts[code])
+                if not len(occupied):
+                    continue
+                marker.update(size=6 + 4 * np.log10(counts[code, occupied]), line=dict(width=1, color='DarkSlateGrey'))
+                fig.add_trace(trace_type(
+                    x=centers[occupied], y=np.ones(len(occupied), dtype=np.int8),
+                    mode='markers', marker=marker, name=epoch_name,
+                    customdata=counts[code, occupied],
+                    hovertemplate=f"Période={epoch_name}<br>%{{customdata}} découvertes<extra></extra>"
+                ))
+            else:
+                members = codes == code
+                if not members.any():
+                    continue
+                fig.add_trace(trace_type(
+                    x=x[members], y=np.ones(members.sum(), dtype=np.int8),
+                    mode='markers', marker=marker, name=epoch_name,
+                    customdata=np.stack([cols.names[indices[members]], cols.discoverers[indices[members]],
+                                         years[members]], axis=1),
+                    hovertemplate=(f"Période={epoch_name}<br>Année=%{{customdata[2]}}<br>"
+                                   "Nom=%{customdata[0]}<br>Découvreur=%{customdata[1]}<extra></extra>")
+                ))
+
+        fig.update_layout(
+            title="Chronologie des Découvertes des Éléments",
+            xaxis=dict(title="Années avant aujourd'hui" if log_axis else "Année",
+                       type='log' if log_axis else 'linear',
+                       autorange='reversed' if log_axis else True),
+            yaxis=dict(showticklabels=False, title=''),
+            legend=dict(title='Période'),
+            height=400
+        )
+        return fig
+
+    def timeline_bounds(self, selection=None):
+        """Première et dernière années de la sélection, période affichée par défaut (None si une seule année)"""
+        years = self.columns.years if selection is None else self.columns.years[selection]
+        if not len(years) or years.min() == years.max():
+            return None
+        return int(years.min()), int(years.max())
+
+    def timeline_figure(self, selection=None, axis='signed', window=None):
+        return self.cached_figure('timeline', (selection_key(selection), axis, window),
+                                  lambda: self.build_timeline_figure(selection, axis, window))
+
+    def build_playback_figure(self, selection=None):
+        """Construit l'animation du tableau périodique se remplissant au fil des découvertes
+
+        Les éléments sont triés une fois par date; l'état cumulé de chaque palier
+        d'années se réduit alors au nombre d'éléments déjà découverts. Chaque
+        image liste les indices de tous les éléments visibles (selectedpoints):
+        sa taille croît avec ce nombre, d'où la limite de MAX_PLAYBACK_ELEMENTS
+        premiers découverts, qui borne la figure à images × éléments indices.
+        Positions et couleurs ne sont envoyées qu'une fois. Toutes les images
+        partent avec la figure: le curseur et la lecture ne sollicitent plus le serveur.
+        """
+        cols = self.columns
+        order = cols.sort_by_year(selection)[:MAX_PLAYBACK_ELEMENTS]
+        symbols = cols.symbols[order]
+        years = cols.years[order]
+        rows, columns = periodic_positions(symbols)
+        colors = [rgb_to_hex(self.get_element_rgb(symb)) for symb in symbols]
+        customdata = np.stack([cols.names[order], years, cols.discoverers[order]], axis=1)
+
+        # Un palier par année de découverte, regroupés au-delà de MAX_PLAYBACK_FRAMES
+        bucket_ends = np.unique(years)
+        if len(bucket_ends) > MAX_PLAYBACK_FRAMES:
+            bucket_ends = np.unique(bucket_ends[np.linspace(0, len(bucket_ends) - 1, MAX_PLAYBACK_FRAMES).astype(int)])
+        counts = np.minimum(cols.cumulative_counts(bucket_ends, selection), len(order))
+
+        def year_label(year):
+            return f"{-year} av. J.-C." if year < 0 else str(year)
+
+        def title(year, count):
+            epoch = cols.epoch_names[cols.epoch_codes[order[count - 1]]]
+            return f"Découvertes jusqu'en {year_label(year)}: {count} éléments ({epoch})"
+
+        names = [str(year) for year in bucket_ends]
+        frames = [dict(name=name, data=[dict(selectedpoints=list(range(count)))], traces=[1],
+                       layout=dict(title=dict(text=title(year, count))))
+                  for name, year, count in zip(names, bucket_ends, counts)]
+        play = dict(frame=dict(duration=PLAYBACK_FRAME_MS, redraw=True), fromcurrent=True,
+                    transition=dict(duration=0))
+        steps = [dict(label=year_label(year), method='animate',
+                      args=[[name], dict(mode='immediate', frame=dict(duration=0, redraw=True),
+                                         transition=dict(duration=0))])
+                 for name, year in zip(names, bucket_ends)]
+
+        # Cases vides en fond, puis tous les éléments; seuls ceux de l'image courante sont visibles
+        empty = dict(type='scatter', x=columns, y=rows, mode='markers+text', text=symbols,
+                     marker=dict(symbol='square', size=34, color='#EEEEEE', line=dict(width=1, color='#CCCCCC')),
+                     textfont=dict(color='#BBBBBB'), hoverinfo='skip')
+        discovered = dict(type='scatter', x=columns, y=rows, mode='markers+text', text=symbols,
+                          customdata=customdata, selectedpoints=list(range(counts[0])),
+                          marker=dict(symbol='square', size=34, color=colors,
+                                      line=dict(width=1, color='DarkSlateGrey')),
+                          unselected=dict(marker=dict(opacity=0), textfont=dict(color='rgba(0, 0, 0, 0)')),
+                          hovertemplate="%{text} - %{customdata[0]}<br>Découvert en %{customdata[1]}<br>"
+                                        "%{customdata[2]}<extra></extra>")
+        # Figure décrite par des dicts, validée en une fois comme pour la comparaison
+        fig = go.Figure({
+            'data': [empty, discovered],
+            'frames': frames,
+            'layout': dict(
+                title=dict(text=title(bucket_ends[0], counts[0])),
+                xaxis=dict(visible=False, range=[0.5, columns.max() + 0.5]),
+                yaxis=dict(visible=False, autorange='reversed', scaleanchor='x'),
+                showlegend=False,
+                height=600,
+                updatemenus=[dict(type='buttons', direction='left', x=0, y=0, xanchor='left', yanchor='top',
+                                  pad=dict(t=40), buttons=[
+                                      dict(label="▶ Lecture", method='animate', args=[None, play]),
+                                      dict(label="⏸ Pause", method='animate',
+                                           args=[[None], dict(mode='immediate', frame=dict(duration=0, redraw=False))]),
+                                  ])],
+                sliders=[dict(active=0, x=0.15, len=0.85, y=0, yanchor='top', pad=dict(t=30),
+                              currentvalue=dict(prefix="Année: "), steps=steps)],
+            ),
+        }, skip_invalid=True)
+        return fig
+
+    def discovery_card_html(self, element):
+        """Carte HTML d'un élément pour la grille des époques"""
+        rgb_hex = self.index.element_hex(element['symbole'])
+        decouvreur = element['decouvreur']
+        return (
+            f'<div class="discovery-card"><div style="text-align: center;">'
+            f'<h4>{element["symbole"]}</h4>'
+            f'<div class="rgb-spectrum" style="background: linear-gradient(90deg, {rgb_hex}80, {rgb_hex});"></div>'
+            f'<strong>{element["nom"]}</strong><br>'
+            f'<small>Découvert en {element["date_decouverte"] if element["date_decouverte"] > 0 else "Antiquité"}</small><br>'
+            f'<small><em>{decouvreur[:20]}{"..." if len(decouvreur) > 20 else ""}</em></small>'
+            f'</div></div>'
+        )
+
+    def epoch_block_html(self, epoch, elements_epoch):
+        """Bloc HTML d'une époque: en-tête et grille de toutes ses cartes"""
+        epoch_class = epoch['nom'].lower().replace(' ', '').replace('é', 'e')
+        cards = ''.join(self.discovery_card_html(element) for element in elements_epoch)
+        return (
+            f'<div class="epoch-{epoch_class}">'
+            f'<h3>{epoch["nom"]} ({epoch["periode"]})</h3>'
+            f'<p>{epoch["description"]}</p>'
+            f'</div>'
+            f'<div class="discovery-grid">{cards}</div>'
+            f'<hr>'
+        )
+
+    def epoch_blocks_html(self, selection=None):
+        """Blocs HTML de toutes les époques ayant au moins un élément sélectionné"""
+        blocks = []
+        for epoch, indices in zip(self.epochs_data, self.columns.indices_by_epoch(selection)):
+            if selection is not None and not len(indices):
+                continue  # Époque sans élément dans les siècles choisis
+            blocks.append(self.epoch_block_html(epoch, [self.elements_data[i] for i in indices]))
+        return blocks
+
+    def epoch_blocks(self, selection=None):
+        return self.cached_fragment('epoques', selection_key(selection), lambda: self.epoch_blocks_html(selection))
+
+    def build_palette_figure(self, epoch_stats):
+        """Construit le graphique des couleurs moyennes, en une seule trace"""
+        fig = go.Figure(go.Scatter(
+            x=list(range(len(epoch_stats))), y=[1] * len(epoch_stats),
+            mode='markers',
+            marker=dict(size=30, color=[stat['Couleur moyenne'] for stat in epoch_stats],
+                        line=dict(width=2, color='black')),
+            text=[f"{stat['Époque']}<br>RGB: {stat['RGB']}" for stat in epoch_stats],
+            hoverinfo='text'
+        ))
+
+        fig.update_layout(
+            title="Évolution des Palettes Spectrales",
+            xaxis=dict(showticklabels=False, title=""),
+            yaxis=dict(showticklabels=False, title=""),
+            height=300,
+            showlegend=False
+        )
+        return fig
+
+    def compute_epoch_stats(self, selection=None):
+        """Nombre d'éléments et couleur moyenne des éléments avec spectre, par époque"""
+        cols = self.columns
+        selection = np.ones(len(cols), dtype=bool) if selection is None else selection
+        counts = cols.count_by_epoch(selection)
+        avg_rgbs, spectra_counts = cols.mean_rgb_by_epoch(selection & cols.has_spectrum)
+
+        epoch_stats = []
+        for code, epoch in enumerate(self.epochs_data):
+            if spectra_counts[code]:
+                # Couleur moyenne des éléments avec spectre
+                avg_rgb = tuple(int(v) for v in avg_rgbs[code])
+
+                epoch_stats.append({
+                    'Époque': epoch['nom'],
+                    'Période': epoch['periode'],
+                    'Nombre éléments': int(counts[code]),
+                    'Éléments avec spectre': int(spectra_counts[code]),
+                    'Couleur moyenne': f'rgb{avg_rgb}',
+                    'RGB': avg_rgb
+                })
+        return epoch_stats
+
+    def palette_entry_html(self, stat):
+        """Ligne HTML de la palette: couleur moyenne et effectifs d'une époque"""
+        rgb_hex = rgb_to_hex(stat['RGB'])
+        return f"""
+                <div style="display: flex; align-items: center; margin: 10px 0; padding: 10px; background-color: #f8f9fa; border-radius: 5px;">
+                    <div style="width: 50px; height: 50px; background-color: {rgb_hex}; border-radius: 5px; margin-right: 15px; border: 1px solid #ccc;"></div>
+                    <div>
+                        <strong>{stat['Époque']}</strong> ({stat['Période']})<br>
+                        <small>{stat['Éléments avec spectre']}/{stat['Nombre éléments']} éléments avec spectre RGB</small>
+                    </div>
+                </div>
+                """
+
+    def epoch_stats(self, selection):
+        return self.cached_fragment('palette', selection_key(selection), lambda: self.compute_epoch_stats(selection))
+
+    def palette_figure(self, selection):
+        return self.cached_figure('palette', selection_key(selection),
+                                  lambda: self.build_palette_figure(self.epoch_stats(selection)))
+
+    def spectrum_figure(self, element_symb):
+        return self.cached_figure('spectre', (element_symb, SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH),
+                                  lambda: self.build_spectrum_figure(element_symb))
+
+    def build_spectrum_figure(self, element_symb):
+        """Construit le spectre simulé d'un élément"""
+        lambda_range = self.spectra.grid(SPECTRUM_RESOLUTION)
+        spectre = self.spectra.spectrum(element_symb, SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH)
+
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(
+            x=lambda_range, y=spectre,
+            mode='lines',
+            line=dict(color=self.index.element_hex(element_symb), width=3),
+            name=f"Spectre {element_symb}"
+        ))
+
+        fig.update_layout(
+            title=f"Spectre simulé de {element_symb}",
+            xaxis=dict(title="Longueur d'onde (nm)"),
+            yaxis=dict(title="Intensité relative"),
+            height=200,
+            showlegend=False
+        )
+        return fig
+
+    def explorer_labels(self, indices):
+        """Libellés « symbole - nom » des éléments, pour la liste de l'explorateur"""
+        return [f"{self.elements_data[i]['symbole']} - {self.elements_data[i]['nom']}" for i in indices]
+
+    def build_explorer_options(self, selection=None):
+        indices = range(len(self.elements_data)) if selection is None else np.flatnonzero(selection)
+        return self.explorer_labels(indices)
+
+    def explorer_options(self, selection=None):
+        return self.cached_fragment('options', selection_key(selection),
+                                    lambda: self.build_explorer_options(selection))
+
+    def element_banner_html(self, element_symb):
+        """Bandeau HTML d'un élément: symbole, nom et pastille de couleur"""
+        element_data = self.index.by_symbol[element_symb]
+        rgb_hex = self.index.element_hex(element_symb)
+        return f"""
+            <div style="text-align: center; padding: 20px; background: linear-gradient(135deg, {rgb_hex}20, {rgb_hex}50); border-radius: 10px;">
+                <h2>{element_data['symbole']} - {element_data['nom']}</h2>
+                <div style="display: flex; justify-content: center; align-items: center; margin: 20px 0;">
+                    <div style="width: 100px; height: 100px; background-color: {rgb_hex}; border-radius: 50%; border: 3px solid white; box-shadow: 0 4px 8px rgba(0,0,0,0.2);"></div>
+                </div>
+                <p><strong>Spectre RGB caractéristique</strong></p>
+            </div>
+            """
+
+    def element_cards_html(self, element_symb):
+        """Cartes HTML d'un élément: historique, spectre et en-tête du spectre simulé"""
+        element_data = self.index.by_symbol[element_symb]
+        rgb = self.get_element_rgb(element_symb)
+        history_html = f"""
+            <div class="discovery-card">
+                <h4>📜 Historique</h4>
+                <strong>Date de découverte:</strong> {element_data['date_decouverte'] if element_data['date_decouverte'] > 0 else 'Antiquité'}<br>
+                <strong>Découvreur:</strong> {element_data['decouvreur']}<br>
+                <strong>Période historique:</strong> {element_data['periode_epoch']}
+            </div>
+            """
+
+        if element_symb in self.spectral_data:
+            spectral_info = self.spectral_data[element_symb]
+            spectrum_html = f"""
+                <div class="discovery-card">
+                    <h4>🌈 Spectre</h4>
+                    <strong>Couleur RGB:</strong> {rgb}<br>
+                    <strong>Longueur d'onde principale:</strong> {spectral_info['longueur_onde_principale']} nm<br>
+                    <strong>Raies caractéristiques:</strong><br>
+                    {', '.join(map(str, spectral_info['raies']))}
+                </div>
+                """
+        else:
+            spectrum_html = f"""
+                <div class="discovery-card">
+                    <h4>🌈 Spectre</h4>
+                    <strong>Couleur d'époque:</strong> {rgb}<br>
+                    <em>Spectre RGB spécifique non défini</em>
+                </div>
+                """
+
+        simulated_html = """
+            <div class="discovery-card">
+                <h4>📊 Spectre Simulé</h4>
+            </div>
+            """
+        return history_html, spectrum_html, simulated_html
+
+    def build_comparison_figure(self, symbols):
+        """Superpose les spectres simulés de plusieurs éléments, calculés en un seul lot"""
+        grid = self.spectra.grid(SPECTRUM_RESOLUTION)
+        spectra = self.spectra.spectra(symbols, SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH)
+        trace_type = 'scattergl' if len(symbols) * SPECTRUM_RESOLUTION > WEBGL_THRESHOLD * 10 else 'scatter'
+        # Traces décrites par des dicts, validées en une fois; la figure est ensuite servie par le cache
+        fig = go.Figure({'data': [
+            dict(type=trace_type, x=grid, y=spectrum, mode='lines', name=symb,
+                 line=dict(color=self.index.element_hex(symb), width=2))
+            for symb, spectrum in zip(symbols, spectra)
+        ]}, skip_invalid=True)
+        fig.update_layout(
+            title=f"Spectres simulés de {len(symbols)} éléments",
+            xaxis=dict(title="Longueur d'onde (nm)"),
+            yaxis=dict(title="Intensité relative"),
+            height=400
+        )
+        return fig
+
+    def compute_overlaps(self, symbols):
+        """Matrice de recouvrement des spectres et paires les plus proches, avec leur écart de découverte"""
+        spectra = self.spectra.spectra(symbols, SPECTRUM_RESOLUTION, SPECTRUM_LINE_WIDTH)
+        overlaps = overlap_matrix(spectra)
+        years = np.array([self.index.by_symbol[symb]['date_decouverte'] for symb in symbols])
+        first, second = np.triu_indices(len(symbols), k=1)
+        best = np.argsort(-overlaps[first, second], kind='stable')[:COMPARISON_PAIRS]
+        pairs = [
+            {'Élément A': symbols[first[k]], 'Élément B': symbols[second[k]],
+             'Recouvrement': round(float(overlaps[first[k], second[k]]), 3),
+             'Écart (années)': int(abs(years[first[k]] - years[second[k]]))}
+            for k in best
+        ]
+        return overlaps, pairs
+
+    def build_overlap_figure(self, symbols, overlaps):
+        """Carte du recouvrement deux à deux des spectres"""
+        fig = go.Figure(go.Heatmap(
+            z=overlaps, x=symbols, y=symbols, zmin=0, zmax=1, colorscale='Viridis',
+            hovertemplate="%{x} / %{y}<br>Recouvrement=%{z:.3f}<extra></extra>"
+        ))
+        fig.update_layout(
+            title="Recouvrement des spectres",
+            yaxis=dict(autorange='reversed'),
+            height=500
+        )
+        return fig
+
+    def discovery_deltas(self, symbols):
+        """Éléments comparés par ordre de découverte, avec l'écart au précédent et au premier"""
+        records = sorted((self.index.by_symbol[symb] for symb in symbols), key=lambda e: e['date_decouverte'])
+        years = np.array([e['date_decouverte'] for e in records])
+        previous = np.diff(years, prepend=years[:1])
+        return [
+            {'Élément': e['symbole'], 'Nom': e['nom'], 'Découverte': int(year),
+             'Écart au précédent': int(gap), 'Écart au premier': int(year - years[0])}
+            for e, year, gap in zip(records, years, previous)
+        ]
+
+    def build_line_spectrum_figure(self, start, end):
+        """Construit le spectre de raies de tout le catalogue, agrégé côté serveur"""
+        centers, totals = self.lines.binned_intensity(*VISIBLE_RANGE, LINE_PLOT_BINS)
+        colors = [rgb_to_hex(rgb) for rgb in self.colors.wavelength_to_rgb(centers)]
+        fig = go.Figure(go.Bar(x=centers, y=totals, marker_color=colors, marker_line_width=0))
+        fig.add_vrect(x0=start, x1=end, fillcolor='grey', opacity=0.2, line_width=0)
+        fig.update_layout(
+            title=f"Raies d'émission du catalogue ({len(self.lines)} raies)",
+            xaxis=dict(title="Longueur d'onde (nm)"),
+            yaxis=dict(title="Intensité cumulée"),
+            height=300,
+            bargap=0,
+            showlegend=False
+        )
+        return fig
+
+
+# Instrumentation des constructions de figures et de données, si DASHBOARD_PROFILE est défini
+PROFILER.instrument(DashboardViews, lambda name: name.startswith('build_'))